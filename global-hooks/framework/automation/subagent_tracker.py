@@ -56,11 +56,13 @@ def main():
         tool_input = hook_input.get("tool_input", {})
         tool_output = hook_input.get("tool_output", "")
 
+        # Serialize non-string output once; it feeds both the length and
+        # the error-signal scan below.
+        output_text = tool_output if isinstance(tool_output, str) else json.dumps(tool_output)
+
         # Compute output length
-        if isinstance(tool_output, str):
-            output_length = len(tool_output)
-        elif isinstance(tool_output, dict):
-            output_length = len(json.dumps(tool_output))
+        if isinstance(tool_output, (str, dict)):
+            output_length = len(output_text)
         else:
             output_length = 0
 
@@ -76,11 +78,10 @@ def main():
             agent_name = tool_input[:80]
 
         # ── Anomaly Detection ─────────────────────────────────────────────
-        output_text = tool_output if isinstance(tool_output, str) else json.dumps(tool_output)
-
         is_empty_output = output_length < MINIMUM_MEANINGFUL_OUTPUT
 
-        has_error_signal = any(p in output_text.lower() for p in ERROR_PATTERNS)
+        output_lower = output_text.lower()
+        has_error_signal = any(p in output_lower for p in ERROR_PATTERNS)
 
         # Check if this is a CAF role agent with an expected output file
         output_file_missing = False
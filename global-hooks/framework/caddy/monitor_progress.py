@@ -22,6 +22,7 @@ Exit: Always 0 (never blocks)
 """
 
 import json
+import re
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -31,6 +32,13 @@ PROGRESS_DIR = Path.home() / ".claude" / "logs" / "caddy"
 PROGRESS_FILE = PROGRESS_DIR / "progress.json"
 MAX_EVENTS = 500  # Cap stored events to prevent unbounded growth
 MAX_ERRORS = 50   # Cap stored errors
+ERROR_RE = re.compile(
+    "|".join(map(re.escape, [
+        "error:", "traceback", "exception", "failed",
+        "permission denied", "not found",
+    ])),
+    re.IGNORECASE,
+)
 
 
 def load_progress() -> dict:
@@ -231,13 +239,7 @@ def main():
 
         # Check for errors in output
         output_str = str(tool_output)[:2000] if tool_output else ""
-        is_error = any(
-            indicator in output_str.lower()
-            for indicator in [
-                "error:", "traceback", "exception", "failed",
-                "permission denied", "not found",
-            ]
-        )
+        is_error = ERROR_RE.search(output_str) is not None
 
         if is_error and tool_name != "Read":
             # Read tool "errors" are often just file-not-found which is normal
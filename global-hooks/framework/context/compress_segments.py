@@ -105,6 +105,7 @@ def save_compressed_segment(segment_id: str, topic: str, compressed_content: str
     storage_path = storage_dir / f"{segment_id}.json"
 
     session_id = os.environ.get("CLAUDE_SESSION_ID", "unknown")
+    content_lower = compressed_content.lower()
 
     segment_data = {
         "segment_id": segment_id,
@@ -124,7 +125,7 @@ def save_compressed_segment(segment_id: str, topic: str, compressed_content: str
         "key_files": key_files,
         "metadata": {
             "contains_code": any(f.endswith(('.py', '.js', '.ts', '.go', '.rs')) for f in key_files),
-            "contains_errors": "error" in compressed_content.lower() or "fix" in compressed_content.lower(),
+            "contains_errors": "error" in content_lower or "fix" in content_lower,
             "task_completed": metadata.get("completed", True),
             **metadata
         }
@@ -28,16 +28,28 @@ from pathlib import Path
 # Import knowledge_db from same directory
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Interned tag and tool names shared by the extractors
+TAG_LEARNED = sys.intern("LEARNED")
+TAG_DECISION = sys.intern("DECISION")
+TAG_FACT = sys.intern("FACT")
+TAG_PATTERN = sys.intern("PATTERN")
+TAG_INVESTIGATION = sys.intern("INVESTIGATION")
+
+TOOL_BASH = sys.intern("Bash")
+TOOL_WRITE = sys.intern("Write")
+TOOL_EDIT = sys.intern("Edit")
+TOOL_READ = sys.intern("Read")
+
 
 # Explicit markers in file content or command output
 _EXPLICIT_MARKERS = {
-    r"#\s*DECISION\s*:\s*(.+)": "DECISION",
-    r"#\s*LEARNED\s*:\s*(.+)": "LEARNED",
-    r"#\s*FACT\s*:\s*(.+)": "FACT",
-    r"#\s*NOTE\s*:\s*(.+)": "FACT",
-    r"#\s*PATTERN\s*:\s*(.+)": "PATTERN",
-    r"#\s*INVESTIGATION\s*:\s*(.+)": "INVESTIGATION",
-    r"#\s*TODO.*investigate\s*:\s*(.+)": "INVESTIGATION",
+    r"#\s*DECISION\s*:\s*(.+)": TAG_DECISION,
+    r"#\s*LEARNED\s*:\s*(.+)": TAG_LEARNED,
+    r"#\s*FACT\s*:\s*(.+)": TAG_FACT,
+    r"#\s*NOTE\s*:\s*(.+)": TAG_FACT,
+    r"#\s*PATTERN\s*:\s*(.+)": TAG_PATTERN,
+    r"#\s*INVESTIGATION\s*:\s*(.+)": TAG_INVESTIGATION,
+    r"#\s*TODO.*investigate\s*:\s*(.+)": TAG_INVESTIGATION,
 }
 
 # Success signals in Bash output → LEARNED
@@ -78,7 +90,7 @@ def extract_from_tool_output(tool_name: str, tool_input: dict, tool_output: str,
     tool_input = tool_input or {}
 
     # --- Bash ---
-    if tool_name == "Bash":
+    if tool_name == TOOL_BASH:
         command = tool_input.get("command", "")
         desc = tool_input.get("description", "")
 
@@ -87,7 +99,7 @@ def extract_from_tool_output(tool_name: str, tool_input: dict, tool_output: str,
             if len(output) < 2000:
                 entries.append({
                     "content": f"Command produced error: `{command[:120]}`\nOutput: {output[:400]}",
-                    "tag": "INVESTIGATION",
+                    "tag": TAG_INVESTIGATION,
                     "context": _infer_context(command),
                 })
 
@@ -98,7 +110,7 @@ def extract_from_tool_output(tool_name: str, tool_input: dict, tool_output: str,
                 label = desc or command[:80]
                 entries.append({
                     "content": f"Successful outcome: {label}\nSignal: {m.group(0)}",
-                    "tag": "LEARNED",
+                    "tag": TAG_LEARNED,
                     "context": _infer_context(command),
                 })
                 break  # one LEARNED per command
@@ -109,7 +121,7 @@ def extract_from_tool_output(tool_name: str, tool_input: dict, tool_output: str,
             if m:
                 entries.append({
                     "content": f"Git commit: {m.group(1).strip()}",
-                    "tag": "DECISION",
+                    "tag": TAG_DECISION,
                     "context": _infer_context(command),
                 })
 
@@ -118,12 +130,12 @@ def extract_from_tool_output(tool_name: str, tool_input: dict, tool_output: str,
             if "error" not in output_lower and len(output) < 1000:
                 entries.append({
                     "content": f"Installed/set up: `{command[:120]}`",
-                    "tag": "FACT",
+                    "tag": TAG_FACT,
                     "context": _infer_context(command),
                 })
 
     # --- Write / Edit ---
-    elif tool_name in ("Write", "Edit"):
+    elif tool_name in (TOOL_WRITE, TOOL_EDIT):
         file_path = tool_input.get("file_path", "")
         content = tool_input.get("new_string", "") or tool_input.get("content", "")
 
@@ -131,18 +143,18 @@ def extract_from_tool_output(tool_name: str, tool_input: dict, tool_output: str,
         if any(name in file_path.lower() for name in _ARCH_FILES):
             entries.append({
                 "content": f"Modified architecture/config file: {file_path}",
-                "tag": "DECISION",
+                "tag": TAG_DECISION,
                 "context": _infer_context(file_path),
             })
 
         # New file creation → FACT (skip temp files and /tmp/)
-        if tool_name == "Write" and file_path:
+        if tool_name == TOOL_WRITE and file_path:
             fname = Path(file_path).name.lower()
             if (not file_path.startswith("/tmp/")
                     and not any(fname.endswith(ext) for ext in (".log", ".tmp", ".pyc", ".txt"))):
                 entries.append({
                     "content": f"Created file: {file_path}",
-                    "tag": "FACT",
+                    "tag": TAG_FACT,
                     "context": _infer_context(file_path),
                 })
 
@@ -150,7 +162,7 @@ def extract_from_tool_output(tool_name: str, tool_input: dict, tool_output: str,
         entries.extend(_extract_markers(content, file_path))
 
     # --- Read (key knowledge files only) ---
-    elif tool_name == "Read":
+    elif tool_name == TOOL_READ:
         file_path = tool_input.get("file_path", "")
         fname = Path(file_path).name.lower()
         if any(kw in fname for kw in _KNOWLEDGE_FILES):
@@ -160,7 +172,7 @@ def extract_from_tool_output(tool_name: str, tool_input: dict, tool_output: str,
                 snippet = " ".join(lines[:3])[:200]
                 entries.append({
                     "content": f"Key file `{Path(file_path).name}`: {snippet}",
-                    "tag": "FACT",
+                    "tag": TAG_FACT,
                     "context": _infer_context(file_path),
                 })
 
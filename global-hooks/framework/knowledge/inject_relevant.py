@@ -12,13 +12,18 @@ based on the current working directory and recent file context,
 then injects them into the session via hookSpecificOutput.
 """
 
+import atexit
+import functools
+import heapq
 import json
 import os
 import signal
 import sqlite3
 import subprocess
 import sys
+import threading
 from datetime import datetime, timezone, timedelta
+from operator import itemgetter
 from pathlib import Path
 
 # Import canonical DB path from the single source of truth
@@ -29,6 +34,12 @@ CONFIG_PATH = Path.home() / ".claude" / "knowledge_pipeline.yaml"
 DB_PATH = get_canonical_db_path()
 DB_DIR = DB_PATH.parent
 
+# Interned category names shared by config defaults and formatting
+CAT_LEARNED = sys.intern("LEARNED")
+CAT_PATTERN = sys.intern("PATTERN")
+CAT_INVESTIGATION = sys.intern("INVESTIGATION")
+DEFAULT_CATEGORIES = (CAT_LEARNED, CAT_PATTERN, CAT_INVESTIGATION)
+
 
 def load_config():
     """Load pipeline config with safe defaults."""
@@ -38,7 +49,7 @@ def load_config():
             "max_injections": 5,
             "relevance_threshold": 0.6,
             "recency_boost": 0.2,
-            "include_categories": ["LEARNED", "PATTERN", "INVESTIGATION"],
+            "include_categories": list(DEFAULT_CATEGORIES),
             "lookback_days": 30,
         }
     }
@@ -59,20 +70,51 @@ def now_iso():
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+# Connection tuning applied once when the shared connection is opened.
+_DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+_db_lock = threading.Lock()
+_db_conn = None
+_db_conn_path = None
+
+
 def get_db():
-    """Get database connection (read-only mode)."""
-    if not DB_PATH.exists():
-        return None
-    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    return conn
+    """Get the shared database connection (read-only mode).
+
+    The connection is opened once per process and reused by later calls;
+    it is closed at interpreter exit, so callers must not close it.
+    """
+    global _db_conn, _db_conn_path
+    with _db_lock:
+        if _db_conn is not None and _db_conn_path == DB_PATH:
+            return _db_conn
+        if not DB_PATH.exists():
+            return None
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in _DB_PRAGMAS:
+            conn.execute(pragma)
+        if _db_conn is not None:
+            _db_conn.close()
+        atexit.register(conn.close)
+        _db_conn, _db_conn_path = conn, DB_PATH
+        return conn
 
 
 # ---------------------------------------------------------------------------
 # Context gathering
 # ---------------------------------------------------------------------------
 
+# Maps common path-name separators to spaces in a single pass
+_SEPARATORS_TO_SPACE = str.maketrans("-_.", "   ")
+
+
 def get_cwd_context():
     """Extract search context from the current working directory."""
     cwd = Path.cwd()
@@ -81,7 +123,7 @@ def get_cwd_context():
     # Directory name parts
     for part in cwd.parts[-3:]:
         # Split on common separators
-        for word in part.replace("-", " ").replace("_", " ").replace(".", " ").split():
+        for word in part.translate(_SEPARATORS_TO_SPACE).split():
             if len(word) > 2 and word.lower() not in ("users", "home", "documents", "src", "lib"):
                 terms.append(word.lower())
 
@@ -130,7 +172,7 @@ def get_recent_files_context():
             capture_output=True, text=True, timeout=2, cwd=str(cwd)
         )
         if result.returncode == 0:
-            for filepath in result.stdout.strip().split("\n")[:10]:
+            for filepath in result.stdout.strip().split("\n", 10)[:10]:
                 if filepath:
                     # Extract meaningful parts from file paths
                     p = Path(filepath)
@@ -159,50 +201,78 @@ def _table_exists(conn, table_name):
         return False
 
 
+# SQL text depends only on the number of categories, so it is built once per
+# count; identical text also keeps hitting sqlite3's statement cache.
+
+@functools.lru_cache(maxsize=16)
+def _entries_fts_sql(num_categories):
+    cat_placeholders = ",".join("?" * num_categories)
+    return (
+        "SELECT e.id, e.category, e.title, e.content, e.tags, "
+        "e.confidence, e.created_at, e.source, rank "
+        "FROM knowledge_entries_fts f "
+        "JOIN knowledge_entries e ON f.rowid = e.id "
+        "WHERE knowledge_entries_fts MATCH ? "
+        f"AND e.category IN ({cat_placeholders}) "
+        "AND e.created_at > ? "
+        "AND (e.expires_at IS NULL OR e.expires_at > ?) "
+        "ORDER BY rank "
+        "LIMIT ?"
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _entries_recent_sql(num_categories):
+    cat_placeholders = ",".join("?" * num_categories)
+    return (
+        "SELECT id, category, title, content, tags, confidence, created_at, source "
+        "FROM knowledge_entries "
+        f"WHERE category IN ({cat_placeholders}) "
+        "AND created_at > ? "
+        "AND (expires_at IS NULL OR expires_at > ?) "
+        "ORDER BY created_at DESC "
+        "LIMIT ?"
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _knowledge_table_sql(num_categories):
+    tag_placeholders = ",".join("?" * num_categories)
+    return (
+        "SELECT k.id, k.tag AS category, k.content AS title, k.content, "
+        "k.tag AS tags, 0.5 AS confidence, k.timestamp AS created_at, "
+        "'extract_learnings' AS source "
+        "FROM knowledge k "
+        f"WHERE k.tag IN ({tag_placeholders}) "
+        "AND k.timestamp > ? "
+        "ORDER BY k.timestamp DESC "
+        "LIMIT ?"
+    )
+
+
 def _search_knowledge_entries(conn, search_terms, config):
     """Search the knowledge_entries table (store_learnings.py schema)."""
-    categories = config.get("include_categories", ["LEARNED", "PATTERN", "INVESTIGATION"])
+    categories = list(config.get("include_categories", DEFAULT_CATEGORIES))
     max_results = config.get("max_injections", 5)
     lookback_days = config.get("lookback_days", 30)
     query = " OR ".join(search_terms[:10])
     cutoff = (datetime.now(timezone.utc) - timedelta(days=lookback_days)).strftime(
         "%Y-%m-%dT%H:%M:%SZ"
     )
-    cat_placeholders = ",".join(["?" for _ in categories])
+    now = now_iso()
 
     # Try FTS first (knowledge_entries_fts is the FTS table for knowledge_entries)
     try:
-        sql = (
-            "SELECT e.id, e.category, e.title, e.content, e.tags, "
-            "e.confidence, e.created_at, e.source, rank "
-            "FROM knowledge_entries_fts f "
-            "JOIN knowledge_entries e ON f.rowid = e.id "
-            "WHERE knowledge_entries_fts MATCH ? "
-            f"AND e.category IN ({cat_placeholders}) "
-            "AND e.created_at > ? "
-            "AND (e.expires_at IS NULL OR e.expires_at > ?) "
-            "ORDER BY rank "
-            f"LIMIT ?"
-        )
-        params = [query] + categories + [cutoff, now_iso(), max_results * 2]
-        rows = conn.execute(sql, params).fetchall()
+        params = [query] + categories + [cutoff, now, max_results * 2]
+        rows = conn.execute(_entries_fts_sql(len(categories)), params).fetchall()
         return [dict(r) for r in rows]
     except Exception:
         pass
 
     # Fallback: recent entries without FTS
     try:
-        sql = (
-            "SELECT id, category, title, content, tags, confidence, created_at, source "
-            "FROM knowledge_entries "
-            f"WHERE category IN ({cat_placeholders}) "
-            "AND created_at > ? "
-            "AND (expires_at IS NULL OR expires_at > ?) "
-            "ORDER BY created_at DESC "
-            f"LIMIT ?"
-        )
-        params = categories + [cutoff, now_iso(), max_results]
-        rows = conn.execute(sql, params).fetchall()
+        params = categories + [cutoff, now, max_results]
+        rows = conn.execute(_entries_recent_sql(len(categories)), params).fetchall()
         return [dict(r) for r in rows]
     except Exception:
         return []
@@ -215,27 +285,16 @@ def _search_knowledge_table(conn, search_terms, config):
     to the 'knowledge' table via knowledge_db.add_knowledge(), so we must also
     read from it here.
     """
-    categories = config.get("include_categories", ["LEARNED", "PATTERN", "INVESTIGATION"])
+    categories = list(config.get("include_categories", DEFAULT_CATEGORIES))
     max_results = config.get("max_injections", 5)
     lookback_days = config.get("lookback_days", 30)
     cutoff = (datetime.now(timezone.utc) - timedelta(days=lookback_days)).strftime(
         "%Y-%m-%dT%H:%M:%SZ"
     )
-    tag_placeholders = ",".join(["?" for _ in categories])
 
     try:
-        sql = (
-            "SELECT k.id, k.tag AS category, k.content AS title, k.content, "
-            "k.tag AS tags, 0.5 AS confidence, k.timestamp AS created_at, "
-            "'extract_learnings' AS source "
-            "FROM knowledge k "
-            f"WHERE k.tag IN ({tag_placeholders}) "
-            "AND k.timestamp > ? "
-            "ORDER BY k.timestamp DESC "
-            f"LIMIT ?"
-        )
         params = categories + [cutoff, max_results]
-        rows = conn.execute(sql, params).fetchall()
+        rows = conn.execute(_knowledge_table_sql(len(categories)), params).fetchall()
         return [dict(r) for r in rows]
     except Exception:
         return []
@@ -297,10 +356,8 @@ def rank_and_filter(results, config):
         r["_score"] = total_score
         scored.append(r)
 
-    # Sort by score descending
-    scored.sort(key=lambda x: x["_score"], reverse=True)
-
-    return scored[:max_injections]
+    # Top N by score descending (partial selection instead of a full sort)
+    return heapq.nlargest(max_injections, scored, key=itemgetter("_score"))
 
 
 def load_facts_text(cwd: str) -> str:
@@ -370,7 +427,7 @@ def format_injection(learnings):
     lines = ["## Relevant Knowledge from Previous Sessions", ""]
 
     for entry in learnings:
-        category = entry.get("category", "LEARNED")
+        category = entry.get("category", CAT_LEARNED)
         content = entry.get("content", "")
         # Strip the "Context: ..." suffix we added during storage
         if "\n\nContext: " in content:
@@ -429,53 +486,49 @@ def main():
     if not config.get("enabled", True):
         return
 
-    # Get database connection
+    # Get the shared database connection (closed at exit, not here)
     conn = get_db()
     if conn is None:
         return
 
-    try:
-        # Gather search context
-        cwd_terms = get_cwd_context()
-        file_terms = get_recent_files_context()
-        all_terms = list(set(cwd_terms + file_terms))
+    # Gather search context
+    cwd_terms = get_cwd_context()
+    file_terms = get_recent_files_context()
+    all_terms = list(set(cwd_terms + file_terms))
 
-        if not all_terms:
-            # No context available, fall back to recent learnings
-            all_terms = ["learned", "pattern", "workflow"]
+    if not all_terms:
+        # No context available, fall back to recent learnings
+        all_terms = ["learned", "pattern", "workflow"]
 
-        # Search knowledge database
-        results = search_knowledge(conn, all_terms, config)
+    # Search knowledge database
+    results = search_knowledge(conn, all_terms, config)
 
-        if not results:
-            return
+    if not results:
+        return
 
-        # Rank and filter
-        top_learnings = rank_and_filter(results, config)
+    # Rank and filter
+    top_learnings = rank_and_filter(results, config)
 
-        if not top_learnings:
-            return
+    if not top_learnings:
+        return
 
-        # Dedup against FACTS.md — skip entries already captured in the project fact sheet
-        cwd = input_data.get("cwd", str(Path.cwd()))
-        top_learnings = filter_facts_duplicates(top_learnings, cwd)
+    # Dedup against FACTS.md — skip entries already captured in the project fact sheet
+    cwd = input_data.get("cwd", str(Path.cwd()))
+    top_learnings = filter_facts_duplicates(top_learnings, cwd)
 
-        if not top_learnings:
-            return
+    if not top_learnings:
+        return
 
-        # Format as context injection
-        injection_text = format_injection(top_learnings)
+    # Format as context injection
+    injection_text = format_injection(top_learnings)
 
-        if injection_text:
-            output = {
-                "hookSpecificOutput": {
-                    "additionalContext": injection_text
-                }
+    if injection_text:
+        output = {
+            "hookSpecificOutput": {
+                "additionalContext": injection_text
             }
-            print(json.dumps(output))
-
-    finally:
-        conn.close()
+        }
+        print(json.dumps(output))
 
 
 if __name__ == "__main__":
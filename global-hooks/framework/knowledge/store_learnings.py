@@ -1,7 +1,7 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["pyyaml"]
+# dependencies = ["pyyaml", "orjson"]
 # ///
 """
 LEARN stage of the Knowledge Pipeline.
@@ -12,13 +12,23 @@ stores each learning into the knowledge.db FTS5 database,
 with deduplication, auto-tagging, and session linking.
 """
 
+import functools
 import json
 import os
+import re
 import sqlite3
 import sys
-from datetime import datetime, timezone
+import time
+from itertools import combinations
 from pathlib import Path
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    # stdlib fallback when run outside the uv script environment
+    _json_loads = json.loads
+
 # Import canonical DB path from the single source of truth
 sys.path.insert(0, str(Path(__file__).parent))
 from knowledge_db import get_canonical_db_path
@@ -28,6 +38,9 @@ PENDING_LEARNINGS = Path.home() / ".claude" / "pending_learnings.json"
 DB_PATH = get_canonical_db_path()
 DB_DIR = DB_PATH.parent
 
+# Max FTS5 candidates scored for word overlap in is_duplicate()
+DEDUP_CANDIDATES = 10
+
 # ---------------------------------------------------------------------------
 # Schema (matches knowledge_cli.py exactly)
 # ---------------------------------------------------------------------------
@@ -49,10 +62,13 @@ CREATE TABLE IF NOT EXISTS knowledge_entries (
 CREATE INDEX IF NOT EXISTS idx_cat ON knowledge_entries(category);
 CREATE INDEX IF NOT EXISTS idx_proj ON knowledge_entries(project);
 CREATE INDEX IF NOT EXISTS idx_created ON knowledge_entries(created_at);
+CREATE INDEX IF NOT EXISTS idx_cat_created ON knowledge_entries(category, created_at DESC);
+-- External-content FTS: the index stores no copy of the text, and only
+-- changes to the indexed columns touch it
 CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_entries_fts USING fts5(
     title, content, tags,
     content=knowledge_entries, content_rowid=id,
-    tokenize='porter unicode61'
+    tokenize='porter unicode61 remove_diacritics 2'
 );
 CREATE TRIGGER IF NOT EXISTS kn_ai AFTER INSERT ON knowledge_entries BEGIN
     INSERT INTO knowledge_entries_fts(rowid, title, content, tags) VALUES (new.id, new.title, new.content, new.tags);
@@ -60,7 +76,7 @@ END;
 CREATE TRIGGER IF NOT EXISTS kn_ad AFTER DELETE ON knowledge_entries BEGIN
     INSERT INTO knowledge_entries_fts(knowledge_entries_fts, rowid, title, content, tags) VALUES ('delete', old.id, old.title, old.content, old.tags);
 END;
-CREATE TRIGGER IF NOT EXISTS kn_au AFTER UPDATE ON knowledge_entries BEGIN
+CREATE TRIGGER IF NOT EXISTS kn_au AFTER UPDATE OF title, content, tags ON knowledge_entries BEGIN
     INSERT INTO knowledge_entries_fts(knowledge_entries_fts, rowid, title, content, tags) VALUES ('delete', old.id, old.title, old.content, old.tags);
     INSERT INTO knowledge_entries_fts(rowid, title, content, tags) VALUES (new.id, new.title, new.content, new.tags);
 END;
@@ -77,8 +93,29 @@ CREATE INDEX IF NOT EXISTS idx_rel_to ON knowledge_relations(to_id);
 """
 
 
+_config_cache = {}
+
+
 def load_config():
-    """Load pipeline config with safe defaults."""
+    """Load pipeline config with safe defaults.
+
+    The parsed result is cached by (path, mtime), so repeated calls only
+    re-read the YAML file after it changes.
+    """
+    try:
+        mtime = CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    key = (str(CONFIG_PATH), mtime)
+    cached = _config_cache.get(key)
+    if cached is None:
+        _config_cache.clear()
+        cached = _config_cache[key] = _read_config()
+    return dict(cached)
+
+
+def _read_config():
+    """Parse the pipeline config file, falling back to defaults."""
     defaults = {
         "learn": {
             "enabled": True,
@@ -102,7 +139,7 @@ def load_config():
 
 
 def now_iso():
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
 def _migrate_fts_table(conn):
@@ -134,11 +171,18 @@ def _migrate_fts_table(conn):
 
 
 def get_db():
-    """Get database connection, initializing schema if needed."""
+    """Get database connection, initializing schema if needed.
+
+    The connection is in autocommit mode (isolation_level=None); batch
+    writers open their own transaction with BEGIN IMMEDIATE.
+    """
     DB_DIR.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(str(DB_PATH), isolation_level=None)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
     conn.execute("PRAGMA foreign_keys=ON")
     _migrate_fts_table(conn)
     conn.executescript(SCHEMA)
@@ -146,41 +190,67 @@ def get_db():
     return conn
 
 
-def is_duplicate(conn, content, threshold=0.7):
+# Drops quote characters in one pass when building FTS search terms
+_STRIP_QUOTES = str.maketrans("", "", "\"'")
+
+
+# Word sets stay frozensets of interned str: str hashes are cached and set
+# intersection runs in C, which beats a Python-level merge over packed
+# 64-bit hash arrays for the handful of FTS candidates scored per check.
+@functools.lru_cache(maxsize=4096)
+def _tokenize(content):
+    """Return the lowercased word set of content (memoized across calls).
+
+    Words are interned so set intersections between cached sets mostly
+    resolve by identity instead of string comparison.
+    """
+    return frozenset(map(sys.intern, content.lower().split()))
+
+
+def is_duplicate(conn, content, threshold=0.7, *, tokens=None):
     """Check if a similar learning already exists using FTS5 search.
 
-    Uses BM25 ranking: if the top match has a very good score and
-    the content is very similar, treat it as a duplicate.
+    Candidates come from an FTS5 index lookup (BM25-ranked, at most
+    DEDUP_CANDIDATES rows), so the cost does not grow with table size.
+    Only those candidates get the exact word-overlap check: a duplicate
+    is one containing more than `threshold` of the new content's words.
+    Pass `tokens` (from _tokenize) when the caller already has them.
     """
     # Extract key words for FTS search (first 100 chars, remove special chars)
-    search_terms = content[:100].replace('"', "").replace("'", "")
+    search_terms = content[:100].translate(_STRIP_QUOTES)
     # Build a simple search query from content words
     words = [w for w in search_terms.split() if len(w) > 3]
     if not words:
         return False
 
-    # Use OR query with top words
-    query = " OR ".join(words[:8])
+    # Use OR query with top words, each quoted as an FTS5 string so
+    # punctuation like "error:" or "(exit" is not parsed as query syntax
+    query = " OR ".join(f'"{w}"' for w in words[:8])
 
     try:
-        rows = conn.execute(
-            "SELECT e.content, rank FROM knowledge_entries_fts f "
+        # Plain tuples instead of sqlite3.Row; the constant SQL text stays
+        # in the connection's statement cache across calls
+        cur = conn.cursor()
+        cur.row_factory = None
+        # Only the top-ranked FTS candidates get the word-overlap check
+        cur.execute(
+            "SELECT e.content FROM knowledge_entries_fts f "
             "JOIN knowledge_entries e ON f.rowid = e.id "
             "WHERE knowledge_entries_fts MATCH ? "
-            "ORDER BY rank LIMIT 3",
-            (query,),
-        ).fetchall()
-
-        for row in rows:
-            existing = row["content"].lower().strip()
-            new = content.lower().strip()
+            "ORDER BY rank LIMIT ?",
+            (query, DEDUP_CANDIDATES),
+        )
+
+        new_words = tokens if tokens is not None else _tokenize(content)
+        # overlap / len(new_words) > threshold  <=>  overlap > min_shared;
+        # the overlap is also bounded by len(existing_words)
+        min_shared = threshold * len(new_words)
+        for (existing,) in cur:
             # Simple similarity check: if the contents share > 70% of words
-            existing_words = set(existing.split())
-            new_words = set(new.split())
-            if not new_words:
-                continue
-            overlap = len(existing_words & new_words) / len(new_words)
-            if overlap > threshold:
+            existing_words = _tokenize(existing)
+            if len(existing_words) <= min_shared:
+                continue  # too few words to ever exceed the threshold
+            if len(existing_words & new_words) > min_shared:
                 return True
     except Exception:
         # FTS table might not have data yet
@@ -189,39 +259,39 @@ def is_duplicate(conn, content, threshold=0.7):
     return False
 
 
+# Keyword -> tag map for auto_generate_tags(): tool names mentioned, then
+# common concepts. Matching is plain (case-insensitive) substring search.
+_TAG_KEYWORDS = {
+    **{tool.lower(): f"tool:{tool.lower()}"
+       for tool in ("Edit", "Write", "Read", "Bash", "Grep", "Glob", "Task")},
+    "error": "error-handling",
+    "test": "testing",
+    "performance": "performance",
+    "security": "security",
+    "workflow": "workflow",
+    "git": "git",
+    "search": "search",
+    "file": "file-operations",
+    "debug": "debugging",
+    "refactor": "refactoring",
+}
+# Zero-width lookahead so one scan reports every (possibly overlapping) hit
+_TAG_RE = re.compile("(?=(" + "|".join(map(re.escape, _TAG_KEYWORDS)) + "))")
+
+
 def auto_generate_tags(tag, content, context_str):
     """Generate tags from the learning tag, content, and context."""
-    tags = [tag.lower()]
-
-    # Extract tool names mentioned
-    tools = ["Edit", "Write", "Read", "Bash", "Grep", "Glob", "Task"]
-    for tool in tools:
-        if tool.lower() in content.lower() or tool.lower() in context_str.lower():
-            tags.append(f"tool:{tool.lower()}")
-
-    # Extract common concepts
-    concepts = {
-        "error": "error-handling",
-        "test": "testing",
-        "performance": "performance",
-        "security": "security",
-        "workflow": "workflow",
-        "git": "git",
-        "search": "search",
-        "file": "file-operations",
-        "debug": "debugging",
-        "refactor": "refactoring",
-    }
+    tags = {tag.lower()}
     combined = (content + " " + context_str).lower()
-    for keyword, concept_tag in concepts.items():
-        if keyword in combined:
-            tags.append(concept_tag)
+    tags.update(_TAG_KEYWORDS[m.group(1)] for m in _TAG_RE.finditer(combined))
+    return ",".join(sorted(tags))
 
-    return ",".join(sorted(set(tags)))
 
+def store_learning(conn, learning, session_id, config, commit=True):
+    """Store a single learning entry into the database.
 
-def store_learning(conn, learning, session_id, config):
-    """Store a single learning entry into the database."""
+    Pass commit=False when storing a batch; the caller then commits once.
+    """
     tag = learning.get("tag", "LEARNED")
     content = learning.get("content", "")
     context_str = learning.get("context", "")
@@ -235,9 +305,12 @@ def store_learning(conn, learning, session_id, config):
     if confidence < min_conf:
         return None
 
+    # Word set computed once and shared with the dedup check
+    tokens = _tokenize(content)
+
     # Deduplication check
     if config.get("deduplicate", True):
-        if is_duplicate(conn, content):
+        if is_duplicate(conn, content, tokens=tokens):
             return None
 
     # Generate tags
@@ -271,7 +344,8 @@ def store_learning(conn, learning, session_id, config):
             ts,
         ),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
     return cur.lastrowid
 
 
@@ -281,7 +355,7 @@ def store_learning(conn, learning, session_id, config):
 
 def main():
     try:
-        input_data = json.loads(sys.stdin.read())
+        input_data = _json_loads(sys.stdin.read())
     except (json.JSONDecodeError, ValueError):
         sys.exit(0)
 
@@ -297,8 +371,7 @@ def main():
         sys.exit(0)
 
     try:
-        with open(PENDING_LEARNINGS, "r") as f:
-            pending = json.load(f)
+        pending = _json_loads(PENDING_LEARNINGS.read_bytes())
     except (json.JSONDecodeError, ValueError):
         sys.exit(0)
 
@@ -315,8 +388,11 @@ def main():
     stored_count = 0
     stored_ids = []
     try:
+        # Entries and relations are written in one transaction (one commit);
+        # IMMEDIATE takes the write lock up front instead of upgrading later
+        conn.execute("BEGIN IMMEDIATE")
         for learning in learnings:
-            entry_id = store_learning(conn, learning, session_id, config)
+            entry_id = store_learning(conn, learning, session_id, config, commit=False)
             if entry_id is not None:
                 stored_count += 1
                 stored_ids.append(entry_id)
@@ -324,27 +400,32 @@ def main():
         # Create relations between learnings from same session
         if len(stored_ids) > 1:
             ts = now_iso()
-            for i in range(len(stored_ids)):
-                for j in range(i + 1, len(stored_ids)):
-                    try:
-                        conn.execute(
-                            "INSERT OR IGNORE INTO knowledge_relations "
-                            "(from_id, to_id, relation_type, created_at) "
-                            "VALUES (?, ?, ?, ?)",
-                            (stored_ids[i], stored_ids[j], "same_session", ts),
-                        )
-                    except Exception:
-                        pass
-            conn.commit()
+            relation_rows = [
+                (from_id, to_id, "same_session", ts)
+                for from_id, to_id in combinations(stored_ids, 2)
+            ]
+            try:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO knowledge_relations "
+                    "(from_id, to_id, relation_type, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    relation_rows,
+                )
+            except Exception:
+                pass
+
+        conn.commit()
 
     finally:
         conn.close()
 
     # Clean up pending file after successful storage
     try:
-        # Rename to processed instead of deleting (for auditing)
+        # Rename to processed instead of deleting (for auditing); replace()
+        # is a single atomic rename that also overwrites a previous
+        # .processed.json on every platform
         processed_path = PENDING_LEARNINGS.with_suffix(".processed.json")
-        PENDING_LEARNINGS.rename(processed_path)
+        PENDING_LEARNINGS.replace(processed_path)
     except Exception:
         try:
             PENDING_LEARNINGS.unlink()
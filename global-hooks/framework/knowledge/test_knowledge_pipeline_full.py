@@ -10,8 +10,10 @@ Covers every failure point across all three stages:
 Run: python3 test_knowledge_pipeline_full.py
 """
 
+import io
 import json
 import os
+import shutil
 import sqlite3
 import sys
 import tempfile
@@ -26,6 +28,15 @@ from unittest.mock import MagicMock, patch
 KNOWLEDGE_DIR = Path(__file__).parent
 sys.path.insert(0, str(KNOWLEDGE_DIR))
 
+# ---------------------------------------------------------------------------
+# Timestamps computed once at import and shared by every test
+# ---------------------------------------------------------------------------
+_ISO = "%Y-%m-%dT%H:%M:%SZ"
+_NOW_UTC = datetime.now(timezone.utc)
+NOW = _NOW_UTC.strftime(_ISO)
+PAST_1D = (_NOW_UTC - timedelta(days=1)).strftime(_ISO)
+PAST_60D = (_NOW_UTC - timedelta(days=60)).strftime(_ISO)
+
 
 # ---------------------------------------------------------------------------
 # Helper: create a minimal knowledge DB with FTS5
@@ -44,10 +55,11 @@ CREATE TABLE IF NOT EXISTS knowledge_entries (
     updated_at TEXT NOT NULL,
     expires_at TEXT DEFAULT NULL
 );
+CREATE INDEX IF NOT EXISTS idx_cat_created ON knowledge_entries(category, created_at DESC);
 CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_entries_fts USING fts5(
     title, content, tags,
     content=knowledge_entries, content_rowid=id,
-    tokenize='porter unicode61'
+    tokenize='porter unicode61 remove_diacritics 2'
 );
 CREATE TRIGGER IF NOT EXISTS kn_ai AFTER INSERT ON knowledge_entries BEGIN
     INSERT INTO knowledge_entries_fts(rowid, title, content, tags)
@@ -57,7 +69,7 @@ CREATE TRIGGER IF NOT EXISTS kn_ad AFTER DELETE ON knowledge_entries BEGIN
     INSERT INTO knowledge_entries_fts(knowledge_entries_fts, rowid, title, content, tags)
     VALUES ('delete', old.id, old.title, old.content, old.tags);
 END;
-CREATE TRIGGER IF NOT EXISTS kn_au AFTER UPDATE ON knowledge_entries BEGIN
+CREATE TRIGGER IF NOT EXISTS kn_au AFTER UPDATE OF title, content, tags ON knowledge_entries BEGIN
     INSERT INTO knowledge_entries_fts(knowledge_entries_fts, rowid, title, content, tags)
     VALUES ('delete', old.id, old.title, old.content, old.tags);
     INSERT INTO knowledge_entries_fts(rowid, title, content, tags)
@@ -74,14 +86,36 @@ CREATE TABLE IF NOT EXISTS knowledge_relations (
 """
 
 
+# Schema is parsed once into an in-memory template; fresh DBs are page-copied
+# from it with the backup API instead of re-running the DDL per test.
+_TEMPLATE = sqlite3.connect(":memory:")
+_TEMPLATE.executescript(SCHEMA)
+
+
+def make_memory_db() -> sqlite3.Connection:
+    """Create a fresh in-memory knowledge DB for tests that only need a conn."""
+    conn = sqlite3.connect(":memory:")
+    _TEMPLATE.backup(conn)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
 def make_db(path: Path) -> sqlite3.Connection:
-    """Create a fresh knowledge DB at path."""
+    """Create a fresh knowledge DB at path (or open an existing one)."""
     path.parent.mkdir(parents=True, exist_ok=True)
+    fresh = not path.exists()
     conn = sqlite3.connect(str(path))
+    if fresh:
+        _TEMPLATE.backup(conn)
+    else:
+        conn.executescript(SCHEMA)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
     conn.execute("PRAGMA foreign_keys=ON")
-    conn.executescript(SCHEMA)
     conn.commit()
     return conn
 
@@ -90,8 +124,8 @@ def insert_entry(conn, category, title, content, tags="", confidence=0.8,
                  created_at=None, expires_at=None):
     """Insert a single knowledge entry for testing."""
     if created_at is None:
-        created_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    ts = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        created_at = NOW
+    ts = NOW
     conn.execute(
         "INSERT INTO knowledge_entries "
         "(category, title, content, tags, confidence, source, created_at, updated_at, expires_at) "
@@ -101,6 +135,21 @@ def insert_entry(conn, category, title, content, tags="", confidence=0.8,
     conn.commit()
 
 
+class MemoryDBTestCase(unittest.TestCase):
+    """Base fixture: each test gets ``self.conn``, a fresh in-memory DB.
+
+    The schema lives in the module-level template, so setUp is a page
+    copy rather than DDL. Per-test SAVEPOINT rollback is not used because
+    the code under test commits (store_learning, insert_entry).
+    """
+
+    def setUp(self):
+        self.conn = make_memory_db()
+
+    def tearDown(self):
+        self.conn.close()
+
+
 # ===========================================================================
 # INJECT_RELEVANT.PY tests
 # ===========================================================================
@@ -132,26 +181,19 @@ class TestInjectCWDContext(unittest.TestCase):
             self.assertGreater(len(t), 2, f"Short word found: {t!r}")
 
 
-class TestInjectSearchKnowledge(unittest.TestCase):
+class TestInjectSearchKnowledge(MemoryDBTestCase):
     """Tests for search_knowledge()."""
 
     def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        self.db_path = Path(self.tmpdir) / "knowledge.db"
-        self.conn = make_db(self.db_path)
+        super().setUp()
         self.config = {
             "include_categories": ["LEARNED", "PATTERN", "INVESTIGATION"],
             "max_injections": 5,
             "lookback_days": 30,
         }
 
-    def tearDown(self):
-        self.conn.close()
-
     def _search(self, terms):
-        # Patch DB_PATH and use our conn
-        with patch.object(ir, "DB_PATH", self.db_path):
-            return ir.search_knowledge(self.conn, terms, self.config)
+        return ir.search_knowledge(self.conn, terms, self.config)
 
     def test_empty_terms_returns_empty(self):
         result = ir.search_knowledge(self.conn, [], self.config)
@@ -176,18 +218,16 @@ class TestInjectSearchKnowledge(unittest.TestCase):
             self.assertEqual(r["category"], "DECISION")
 
     def test_expired_entries_excluded(self):
-        past = (datetime.now(timezone.utc) - timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
         insert_entry(self.conn, "LEARNED", "Expired entry",
-                     "this entry is expired hook content", expires_at=past)
+                     "this entry is expired hook content", expires_at=PAST_1D)
         result = self._search(["expired", "hook"])
         # Should not include the expired entry
         for r in result:
             self.assertNotEqual(r["title"], "Expired entry")
 
     def test_old_entries_excluded_by_lookback(self):
-        old_date = (datetime.now(timezone.utc) - timedelta(days=60)).strftime("%Y-%m-%dT%H:%M:%SZ")
         insert_entry(self.conn, "LEARNED", "Old entry",
-                     "old hook pattern content", created_at=old_date)
+                     "old hook pattern content", created_at=PAST_60D)
         result = self._search(["hook", "pattern"])
         for r in result:
             self.assertNotEqual(r["title"], "Old entry")
@@ -206,7 +246,7 @@ class TestInjectRankAndFilter(unittest.TestCase):
     """Tests for rank_and_filter()."""
 
     def _make_entry(self, rank=-1.0, confidence=0.8, age_days=0):
-        ts = (datetime.now(timezone.utc) - timedelta(days=age_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        ts = NOW if age_days == 0 else (_NOW_UTC - timedelta(days=age_days)).strftime(_ISO)
         return {"rank": rank, "confidence": confidence, "created_at": ts,
                 "category": "LEARNED", "content": "x", "tags": ""}
 
@@ -287,38 +327,27 @@ class TestInjectFormatInjection(unittest.TestCase):
         self.assertIn("3 relevant entries found", text)
 
 
-class TestInjectMainOutputFormat(unittest.TestCase):
+class TestInjectMainOutputFormat(MemoryDBTestCase):
     """Test the main() output JSON format (the critical bug we fixed)."""
 
     def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        self.db_path = Path(self.tmpdir) / "knowledge.db"
-        self.conn = make_db(self.db_path)
+        super().setUp()
         insert_entry(self.conn, "LEARNED", "Hook pattern", "hook configuration pattern")
-        self.conn.close()
 
     def test_output_uses_additionalContext_not_contextInjection(self):
         """The critical field name bug: must be additionalContext, not contextInjection."""
-        import io
-        from unittest.mock import patch
-        import inject_relevant as ir_mod
-
         stdin_data = json.dumps({"session_id": "test"})
 
-        with patch.object(ir_mod, "DB_PATH", self.db_path), \
-             patch.object(ir_mod, "get_cwd_context", return_value=["hook", "configuration"]), \
-             patch.object(ir_mod, "get_recent_files_context", return_value=[]):
-
-            conn = make_db(self.db_path)
-            with patch.object(ir_mod, "get_db", return_value=conn):
-                import io as _io
-                captured = _io.StringIO()
-                with patch("sys.stdin", _io.StringIO(stdin_data)), \
-                     patch("sys.stdout", captured):
-                    try:
-                        ir_mod.main()
-                    except SystemExit:
-                        pass
+        with patch.object(ir, "get_cwd_context", return_value=["hook", "configuration"]), \
+             patch.object(ir, "get_recent_files_context", return_value=[]), \
+             patch.object(ir, "get_db", return_value=self.conn):
+            captured = io.StringIO()
+            with patch("sys.stdin", io.StringIO(stdin_data)), \
+                 patch("sys.stdout", captured):
+                try:
+                    ir.main()
+                except SystemExit:
+                    pass
 
         output = captured.getvalue().strip()
         if output:
@@ -332,7 +361,6 @@ class TestInjectMainOutputFormat(unittest.TestCase):
 
     def test_invalid_json_exits_cleanly(self):
         """Invalid stdin JSON should exit 0, never crash."""
-        import io
         with patch("sys.stdin", io.StringIO("NOT JSON")):
             with self.assertRaises(SystemExit) as ctx:
                 ir.main()
@@ -340,7 +368,6 @@ class TestInjectMainOutputFormat(unittest.TestCase):
 
     def test_missing_db_exits_cleanly(self):
         """If DB doesn't exist, exit 0 silently."""
-        import io
         with patch.object(ir, "DB_PATH", Path("/nonexistent/path/knowledge.db")), \
              patch("sys.stdin", io.StringIO(json.dumps({}))):
             with self.assertRaises(SystemExit) as ctx:
@@ -349,7 +376,6 @@ class TestInjectMainOutputFormat(unittest.TestCase):
 
     def test_disabled_config_exits_cleanly(self):
         """If evolve.enabled=False, exit 0."""
-        import io
         with patch.object(ir, "load_config", return_value={"enabled": False}), \
              patch("sys.stdin", io.StringIO(json.dumps({}))):
             with self.assertRaises(SystemExit) as ctx:
@@ -472,6 +498,11 @@ class TestExtractFromToolOutput(unittest.TestCase):
         # Should not crash; tool_input=None means command="" which is still valid
         self.assertIsInstance(result, list)
 
+    def test_non_string_tool_name_no_crash(self):
+        # Malformed payloads may carry a non-string tool_name
+        result = el.extract_from_tool_output(7, {}, "Error: crash", "sess")
+        self.assertEqual(result, [])
+
     def test_failed_keyword_match(self):
         # "failed" in output should trigger INVESTIGATION
         result = el.extract_from_tool_output(
@@ -534,11 +565,14 @@ class TestExtractContextInference(unittest.TestCase):
 class TestExtractMainHookBehavior(unittest.TestCase):
     """Tests for extract_learnings.main() — hook protocol behavior."""
 
-    def _run_main(self, stdin_data: dict):
-        """Run main() and capture exit code."""
-        import io
+    def _run_main(self, stdin_data: dict, modules=None):
+        """Run main() and capture exit code.
+
+        ``modules`` patches sys.modules for the duration of main() only.
+        """
         with patch("sys.stdin", io.StringIO(json.dumps(stdin_data))):
-            with self.assertRaises(SystemExit) as ctx:
+            with self.assertRaises(SystemExit) as ctx, \
+                 patch.dict("sys.modules", modules or {}):
                 el.main()
             return ctx.exception.code
 
@@ -552,7 +586,6 @@ class TestExtractMainHookBehavior(unittest.TestCase):
         self.assertEqual(code, 0)
 
     def test_always_exits_zero_on_invalid_json(self):
-        import io
         with patch("sys.stdin", io.StringIO("INVALID JSON")):
             with self.assertRaises(SystemExit) as ctx:
                 el.main()
@@ -560,13 +593,12 @@ class TestExtractMainHookBehavior(unittest.TestCase):
 
     def test_exits_zero_even_when_db_fails(self):
         """DB import failure must not block the pipeline."""
-        with patch.dict("sys.modules", {"knowledge_db": None}):
-            code = self._run_main({
-                "tool_name": "Bash",
-                "tool_input": {"command": "pytest"},
-                "tool_output": "Error: test failed",
-                "session_id": "test"
-            })
+        code = self._run_main({
+            "tool_name": "Bash",
+            "tool_input": {"command": "pytest"},
+            "tool_output": "Error: test failed",
+            "session_id": "test"
+        }, modules={"knowledge_db": None})
         self.assertEqual(code, 0)
 
     def test_exits_zero_on_missing_tool_name(self):
@@ -620,16 +652,40 @@ class TestStoreAutoGenerateTags(unittest.TestCase):
         self.assertEqual(tags, sorted(tags))
 
 
-class TestStoreIssDuplicate(unittest.TestCase):
-    """Tests for is_duplicate()."""
+class TestStoreLoadConfig(unittest.TestCase):
+    """Tests for load_config() caching."""
 
     def setUp(self):
         self.tmpdir = tempfile.mkdtemp()
-        self.db_path = Path(self.tmpdir) / "knowledge.db"
-        self.conn = make_db(self.db_path)
+        self.config_path = Path(self.tmpdir) / "knowledge_pipeline.yaml"
 
     def tearDown(self):
-        self.conn.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_missing_file_returns_defaults(self):
+        with patch.object(sl, "CONFIG_PATH", self.config_path):
+            self.assertTrue(sl.load_config()["enabled"])
+
+    def test_cached_until_file_changes(self):
+        self.config_path.write_text("learn:\n  min_confidence: 0.5\n")
+        with patch.object(sl, "CONFIG_PATH", self.config_path), \
+             patch.object(sl, "_read_config", wraps=sl._read_config) as read:
+            self.assertEqual(sl.load_config()["min_confidence"], 0.5)
+            self.assertEqual(sl.load_config()["min_confidence"], 0.5)
+            self.assertEqual(read.call_count, 1)
+            self.config_path.write_text("learn:\n  min_confidence: 0.9\n")
+            os.utime(self.config_path, ns=(0, 10**18))
+            self.assertEqual(sl.load_config()["min_confidence"], 0.9)
+            self.assertEqual(read.call_count, 2)
+
+    def test_returns_independent_copies(self):
+        with patch.object(sl, "CONFIG_PATH", self.config_path):
+            sl.load_config()["enabled"] = False
+            self.assertTrue(sl.load_config()["enabled"])
+
+
+class TestStoreIssDuplicate(MemoryDBTestCase):
+    """Tests for is_duplicate()."""
 
     def test_empty_db_not_duplicate(self):
         self.assertFalse(sl.is_duplicate(self.conn, "some new content here"))
@@ -639,6 +695,12 @@ class TestStoreIssDuplicate(unittest.TestCase):
         insert_entry(self.conn, "LEARNED", "title", content)
         self.assertTrue(sl.is_duplicate(self.conn, content))
 
+    def test_punctuated_content_is_duplicate(self):
+        """FTS5 syntax characters in content must not disable the prefilter."""
+        content = "Command produced error: `pytest tests/` (exit 1) failed"
+        insert_entry(self.conn, "INVESTIGATION", "title", content)
+        self.assertTrue(sl.is_duplicate(self.conn, content))
+
     def test_very_different_content_not_duplicate(self):
         insert_entry(self.conn, "LEARNED", "title", "The hook configuration uses uv run")
         self.assertFalse(sl.is_duplicate(self.conn, "Completely unrelated topic about databases"))
@@ -647,6 +709,11 @@ class TestStoreIssDuplicate(unittest.TestCase):
         """Content with no words >3 chars should never be considered duplicate."""
         self.assertFalse(sl.is_duplicate(self.conn, "ok"))
 
+    def test_much_shorter_candidate_not_duplicate(self):
+        insert_entry(self.conn, "LEARNED", "title", "hook configuration")
+        self.assertFalse(sl.is_duplicate(
+            self.conn, "hook configuration uses uv run for every single script"))
+
     def test_custom_threshold(self):
         content = "The hook configuration uses uv run for all scripts here today"
         insert_entry(self.conn, "LEARNED", "title", content)
@@ -654,13 +721,11 @@ class TestStoreIssDuplicate(unittest.TestCase):
         self.assertFalse(sl.is_duplicate(self.conn, content + " extra words", threshold=1.0))
 
 
-class TestStoreStoreLearning(unittest.TestCase):
+class TestStoreStoreLearning(MemoryDBTestCase):
     """Tests for store_learning()."""
 
     def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        self.db_path = Path(self.tmpdir) / "knowledge.db"
-        self.conn = make_db(self.db_path)
+        super().setUp()
         self.config = {
             "auto_tag": True,
             "deduplicate": True,
@@ -668,9 +733,6 @@ class TestStoreStoreLearning(unittest.TestCase):
             "source": "pipeline",
         }
 
-    def tearDown(self):
-        self.conn.close()
-
     def test_stores_basic_learning(self):
         entry_id = sl.store_learning(
             self.conn,
@@ -681,6 +743,31 @@ class TestStoreStoreLearning(unittest.TestCase):
         self.assertIsNotNone(entry_id)
         self.assertIsInstance(entry_id, int)
 
+    def test_commit_false_leaves_transaction_open(self):
+        entry_id = sl.store_learning(
+            self.conn,
+            {"tag": "LEARNED", "content": "Batched hook learning", "confidence": 0.8},
+            "test-session",
+            self.config,
+            commit=False,
+        )
+        self.assertIsNotNone(entry_id)
+        self.assertTrue(self.conn.in_transaction)
+        self.conn.commit()
+
+    def test_auto_tag_disabled_skips_tag_generation(self):
+        config = {**self.config, "auto_tag": False}
+        with patch.object(sl, "auto_generate_tags") as gen:
+            sl.store_learning(
+                self.conn,
+                {"tag": "LEARNED", "content": "Edit the git workflow", "confidence": 0.8},
+                "test-session",
+                config,
+            )
+        gen.assert_not_called()
+        row = self.conn.execute("SELECT tags FROM knowledge_entries ORDER BY id DESC LIMIT 1").fetchone()
+        self.assertEqual(row["tags"], "learned")
+
     def test_empty_content_returns_none(self):
         entry_id = sl.store_learning(
             self.conn,
@@ -788,6 +875,29 @@ class TestStoreStoreLearning(unittest.TestCase):
         row = self.conn.execute("SELECT source FROM knowledge_entries ORDER BY id DESC LIMIT 1").fetchone()
         self.assertIn("my-session-123", row["source"])
 
+    def test_fts_follows_text_updates_only(self):
+        entry_id = sl.store_learning(
+            self.conn,
+            {"tag": "LEARNED", "content": "Retry flaky sockets with backoff", "confidence": 0.8},
+            "test-session",
+            self.config,
+        )
+
+        def fts_ids(term):
+            return [r[0] for r in self.conn.execute(
+                "SELECT rowid FROM knowledge_entries_fts WHERE knowledge_entries_fts MATCH ?",
+                (term,),
+            )]
+
+        self.conn.execute("UPDATE knowledge_entries SET confidence = 0.9 WHERE id = ?", (entry_id,))
+        self.assertEqual(fts_ids("sockets"), [entry_id])
+        self.conn.execute(
+            "UPDATE knowledge_entries SET content = 'Pin the compiler version' WHERE id = ?",
+            (entry_id,),
+        )
+        self.assertEqual(fts_ids("content:sockets"), [])
+        self.assertEqual(fts_ids("content:compiler"), [entry_id])
+
 
 class TestStoreMainHookBehavior(unittest.TestCase):
     """Tests for store_learnings.main() — hook protocol behavior."""
@@ -797,9 +907,11 @@ class TestStoreMainHookBehavior(unittest.TestCase):
         self.db_path = Path(self.tmpdir) / "knowledge.db"
         self.pending_path = Path(self.tmpdir) / "pending_learnings.json"
 
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
     def _run_main(self, stdin_data=None, pending=None):
         """Set up files and run main(), return exit code."""
-        import io
         if stdin_data is None:
             stdin_data = {}
         if pending is not None:
@@ -824,7 +936,7 @@ class TestStoreMainHookBehavior(unittest.TestCase):
         with patch.object(sl, "PENDING_LEARNINGS", self.pending_path), \
              patch.object(sl, "DB_PATH", self.db_path), \
              patch.object(sl, "DB_DIR", self.db_path.parent), \
-             patch("sys.stdin", __import__("io").StringIO(json.dumps({}))):
+             patch("sys.stdin", io.StringIO(json.dumps({}))):
             with self.assertRaises(SystemExit) as ctx:
                 sl.main()
             self.assertEqual(ctx.exception.code, 0)
@@ -834,7 +946,6 @@ class TestStoreMainHookBehavior(unittest.TestCase):
         self.assertEqual(code, 0)
 
     def test_disabled_config_exits_cleanly(self):
-        import io
         pending = {"learnings": [{"tag": "LEARNED", "content": "x", "confidence": 0.8}]}
         with open(self.pending_path, "w") as f:
             json.dump(pending, f)
@@ -871,6 +982,18 @@ class TestStoreMainHookBehavior(unittest.TestCase):
         processed = self.pending_path.with_suffix(".processed.json")
         self.assertTrue(processed.exists())
 
+    def test_pending_file_replaces_previous_processed(self):
+        processed = self.pending_path.with_suffix(".processed.json")
+        processed.write_text(json.dumps({"learnings": ["stale"]}))
+        pending = {
+            "learnings": [
+                {"tag": "LEARNED", "content": "Newer batch replaces the audit copy", "confidence": 0.9}
+            ]
+        }
+        self._run_main(stdin_data={"session_id": "test"}, pending=pending)
+        self.assertFalse(self.pending_path.exists())
+        self.assertEqual(json.loads(processed.read_text()), pending)
+
     def test_multiple_learnings_creates_relations(self):
         pending = {
             "learnings": [
@@ -886,7 +1009,6 @@ class TestStoreMainHookBehavior(unittest.TestCase):
         self.assertEqual(rels[0]["relation_type"], "same_session")
 
     def test_invalid_json_stdin_exits_cleanly(self):
-        import io
         with patch.object(sl, "PENDING_LEARNINGS", self.pending_path), \
              patch("sys.stdin", io.StringIO("INVALID")):
             with self.assertRaises(SystemExit) as ctx:
@@ -898,17 +1020,9 @@ class TestStoreMainHookBehavior(unittest.TestCase):
 # Integration: Full Pipeline Round-Trip
 # ===========================================================================
 
-class TestPipelineRoundTrip(unittest.TestCase):
+class TestPipelineRoundTrip(MemoryDBTestCase):
     """End-to-end test: store via store_learnings logic, retrieve via inject logic."""
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        self.db_path = Path(self.tmpdir) / "knowledge.db"
-        self.conn = make_db(self.db_path)
-
-    def tearDown(self):
-        self.conn.close()
-
     def test_store_then_retrieve(self):
         """Store a learning via store_learnings logic, then find it via inject_relevant."""
         config = {
@@ -934,8 +1048,7 @@ class TestPipelineRoundTrip(unittest.TestCase):
             "recency_boost": 0.2,
         }
 
-        with patch.object(ir, "DB_PATH", self.db_path):
-            results = ir.search_knowledge(self.conn, ["circuit", "breaker", "hooks"], inject_config)
+        results = ir.search_knowledge(self.conn, ["circuit", "breaker", "hooks"], inject_config)
 
         self.assertGreater(len(results), 0)
         contents = [r["content"] for r in results]
@@ -976,8 +1089,7 @@ class TestPipelineRoundTrip(unittest.TestCase):
             "lookback_days": 30,
             "recency_boost": 0.2,
         }
-        with patch.object(ir, "DB_PATH", self.db_path):
-            results = ir.search_knowledge(self.conn, ["pytest", "knowledge", "failed"], inject_config)
+        results = ir.search_knowledge(self.conn, ["pytest", "knowledge", "failed"], inject_config)
         self.assertGreater(len(results), 0)
 
 
@@ -1000,6 +1112,7 @@ if __name__ == "__main__":
         ("extract_learnings.py — Context Inference", TestExtractContextInference),
         ("extract_learnings.py — Hook Behavior", TestExtractMainHookBehavior),
         ("store_learnings.py — Auto Tag Generation", TestStoreAutoGenerateTags),
+        ("store_learnings.py — Config Cache", TestStoreLoadConfig),
         ("store_learnings.py — Deduplication", TestStoreIssDuplicate),
         ("store_learnings.py — Store Entry", TestStoreStoreLearning),
         ("store_learnings.py — Hook Behavior", TestStoreMainHookBehavior),
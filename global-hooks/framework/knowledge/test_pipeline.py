@@ -1,7 +1,7 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["pyyaml"]
+# dependencies = ["pyyaml", "orjson"]
 # ///
 """
 Test script for the Knowledge Pipeline.
@@ -26,9 +26,21 @@ import sqlite3
 import subprocess
 import sys
 import tempfile
-from datetime import datetime, timezone, timedelta
+import time
+from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumpb = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumpb(obj):
+        return json.dumps(obj).encode()
+
 # Use test-specific paths to avoid polluting real data
 TEST_DIR = Path(tempfile.mkdtemp(prefix="knowledge_pipeline_test_"))
 TEST_OBS_FILE = TEST_DIR / "observations.jsonl"
@@ -38,6 +50,18 @@ TEST_PENDING = TEST_DIR / "pending_learnings.json"
 TEST_CONFIG = TEST_DIR / "knowledge_pipeline.yaml"
 
 SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+_ISO_FMT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Per-connection tuning applied to every test DB connection
+_DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=134217728",
+    "PRAGMA cache_size=-65536",
+)
 
 # Colors for terminal output
 GREEN = "\033[92m"
@@ -75,7 +99,7 @@ def generate_mock_observations():
     print_header("Step 1: OBSERVE - Generating mock observations")
 
     session_id = "test-session-001"
-    base_time = datetime.now(timezone.utc) - timedelta(hours=1)
+    base_epoch = int(time.time()) - 3600
     observations = []
 
     # Simulate a typical coding session
@@ -110,7 +134,7 @@ def generate_mock_observations():
 
     for i, (tool, pattern, context) in enumerate(tool_sequence):
         obs = {
-            "timestamp": (base_time + timedelta(minutes=i * 2)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "timestamp": time.strftime(_ISO_FMT, time.gmtime(base_epoch + i * 120)),
             "type": "tool_usage",
             "tool": tool,
             "pattern": pattern,
@@ -122,7 +146,9 @@ def generate_mock_observations():
 
     for i, (tool, pattern, context) in enumerate(error_observations):
         obs = {
-            "timestamp": (base_time + timedelta(minutes=len(tool_sequence) * 2 + i * 3)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "timestamp": time.strftime(
+                _ISO_FMT, time.gmtime(base_epoch + len(tool_sequence) * 120 + i * 180)
+            ),
             "type": "error",
             "tool": tool,
             "pattern": pattern,
@@ -132,10 +158,8 @@ def generate_mock_observations():
         }
         observations.append(obs)
 
-    # Write observations to test file
-    with open(TEST_OBS_FILE, "w") as f:
-        for obs in observations:
-            f.write(json.dumps(obs) + "\n")
+    # Write observations to test file in a single write
+    TEST_OBS_FILE.write_bytes(b"".join(_json_dumpb(obs) + b"\n" for obs in observations))
 
     print_info(f"Generated {len(observations)} mock observations")
     print_info(f"  Tool usage: {len(tool_sequence)}")
@@ -155,8 +179,6 @@ def test_analyze(session_id, observations):
     print_header("Step 2: ANALYZE - Processing observations")
 
     # Import the analyze module to test summarization
-    sys.path.insert(0, str(SCRIPT_DIR))
-
     try:
         # We cannot run the full LLM call in tests, so we test the
         # observation loading and summarization, then provide mock learnings
@@ -172,7 +194,7 @@ def test_analyze(session_id, observations):
         summary = summarize_observations(loaded)
         print_info(f"Summary length: {len(summary)} chars")
         print_info("Summary preview:")
-        for line in summary.split("\n")[:10]:
+        for line in summary.split("\n", 10)[:10]:
             print(f"    {line}")
 
         print_pass("Observation loading and summarization works")
@@ -236,8 +258,30 @@ def test_analyze(session_id, observations):
 # Step 3: Test LEARN stage (store into test database)
 # ---------------------------------------------------------------------------
 
-def test_learn(session_id):
-    """Test storing learnings into a test knowledge database."""
+def open_db(path=TEST_DB_PATH):
+    """Open a tuned autocommit connection to a test knowledge database.
+
+    Callers that batch writes open their own transaction with BEGIN IMMEDIATE.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    for pragma in _DB_PRAGMAS:
+        conn.execute(pragma)
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+_LEARNING_DEFAULTS = {"tag": "LEARNED", "content": "", "context": "", "confidence": 0.5}
+_learning_fields = itemgetter("tag", "content", "context", "confidence")
+
+
+def test_learn(session_id, conn=None):
+    """Test storing learnings into a test knowledge database.
+
+    Uses ``conn`` when given (leaving it open), otherwise opens and closes
+    its own connection.
+    """
     print_header("Step 3: LEARN - Storing learnings in knowledge.db")
 
     # Read pending learnings
@@ -247,71 +291,64 @@ def test_learn(session_id):
     learnings = pending.get("learnings", [])
     print_info(f"Pending learnings to store: {len(learnings)}")
 
-    # Initialize test database
-    TEST_DB_DIR.mkdir(parents=True, exist_ok=True)
-
     # Import schema from store_learnings
-    sys.path.insert(0, str(SCRIPT_DIR))
     try:
         from store_learnings import SCHEMA, now_iso, auto_generate_tags
     except ImportError:
         print_fail("Cannot import store_learnings module")
         return False
 
-    conn = sqlite3.connect(str(TEST_DB_PATH))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
+    owns_conn = conn is None
+    if owns_conn:
+        conn = open_db()
     conn.executescript(SCHEMA)
-    conn.commit()
-
-    stored_count = 0
-    stored_ids = []
 
+    # Entries and relations are stored in a single transaction
+    conn.execute("BEGIN IMMEDIATE")
+    ts = now_iso()
+    entry_rows = []
     for learning in learnings:
-        tag = learning.get("tag", "LEARNED")
-        content = learning.get("content", "")
-        context_str = learning.get("context", "")
-        confidence = learning.get("confidence", 0.5)
+        tag, content, context_str, confidence = _learning_fields({**_LEARNING_DEFAULTS, **learning})
 
         tags = auto_generate_tags(tag, content, context_str)
-        title = content[:80].rstrip(".")
-        if len(content) > 80:
-            title += "..."
-
-        ts = now_iso()
-        cur = conn.execute(
-            "INSERT INTO knowledge_entries "
-            "(category, title, content, tags, project, confidence, source, created_at, updated_at) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            (
-                tag,
-                title,
-                content + ("\n\nContext: " + context_str if context_str else ""),
-                tags,
-                None,
-                confidence,
-                f"pipeline:session:{session_id}",
-                ts,
-                ts,
-            ),
-        )
-        conn.commit()
-        stored_count += 1
-        stored_ids.append(cur.lastrowid)
+        title = content[:80].rstrip(".") + ("..." if len(content) > 80 else "")
+
+        entry_rows.append((
+            tag,
+            title,
+            content + ("\n\nContext: " + context_str if context_str else ""),
+            tags,
+            None,
+            confidence,
+            f"pipeline:session:{session_id}",
+            ts,
+            ts,
+        ))
+
+    # The write lock held since BEGIN IMMEDIATE guarantees the new ids are
+    # exactly those above prev_max
+    prev_max = conn.execute("SELECT COALESCE(MAX(id), 0) FROM knowledge_entries").fetchone()[0]
+    conn.executemany(
+        "INSERT INTO knowledge_entries "
+        "(category, title, content, tags, project, confidence, source, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        entry_rows,
+    )
+    for tag, title, *_ in entry_rows:
         print_info(f"  Stored [{tag}]: {title}")
-
-    # Create relations
-    if len(stored_ids) > 1:
-        ts = now_iso()
-        for i in range(len(stored_ids)):
-            for j in range(i + 1, len(stored_ids)):
-                conn.execute(
-                    "INSERT OR IGNORE INTO knowledge_relations "
-                    "(from_id, to_id, relation_type, created_at) VALUES (?, ?, ?, ?)",
-                    (stored_ids[i], stored_ids[j], "same_session", ts),
-                )
-        conn.commit()
+    stored_count = len(entry_rows)
+
+    # Create relations: pair up the new entries inside SQLite with one self-join
+    if stored_count > 1:
+        conn.execute(
+            "INSERT OR IGNORE INTO knowledge_relations "
+            "(from_id, to_id, relation_type, created_at) "
+            "SELECT a.id, b.id, 'same_session', ? "
+            "FROM knowledge_entries a JOIN knowledge_entries b ON a.id < b.id "
+            "WHERE a.id > ? AND b.id > ?",
+            (ts, prev_max, prev_max),
+        )
+    conn.commit()
 
     # Verify stored entries
     total = conn.execute("SELECT COUNT(*) FROM knowledge_entries").fetchone()[0]
@@ -325,7 +362,8 @@ def test_learn(session_id):
     else:
         print_fail(f"Expected {len(learnings)} entries, got {total}")
 
-    conn.close()
+    if owns_conn:
+        conn.close()
     return stored_count > 0
 
 
@@ -333,13 +371,13 @@ def test_learn(session_id):
 # Step 4: Test EVOLVE stage (FTS5 search and injection)
 # ---------------------------------------------------------------------------
 
-def test_evolve():
+def test_evolve(conn=None):
     """Test retrieving and injecting relevant knowledge."""
     print_header("Step 4: EVOLVE - Injecting relevant knowledge")
 
-    conn = sqlite3.connect(str(TEST_DB_PATH))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
+    owns_conn = conn is None
+    if owns_conn:
+        conn = open_db()
 
     # Test FTS5 search with various queries
     test_queries = [
@@ -388,7 +426,6 @@ def test_evolve():
         entries = [dict(r) for r in rows]
 
         # Import formatting function
-        sys.path.insert(0, str(SCRIPT_DIR))
         from inject_relevant import format_injection
 
         injection = format_injection(entries)
@@ -420,7 +457,8 @@ def test_evolve():
         print_fail(f"Injection formatting failed: {e}")
         all_passed = False
 
-    conn.close()
+    if owns_conn:
+        conn.close()
     return all_passed
 
 
@@ -428,7 +466,7 @@ def test_evolve():
 # Step 5: Full pipeline verification
 # ---------------------------------------------------------------------------
 
-def verify_pipeline():
+def verify_pipeline(conn=None):
     """Run final verification checks."""
     print_header("Step 5: Full Pipeline Verification")
 
@@ -436,7 +474,7 @@ def verify_pipeline():
 
     # Check 1: Observations file exists and has content
     if TEST_OBS_FILE.exists() and TEST_OBS_FILE.stat().st_size > 0:
-        line_count = sum(1 for _ in open(TEST_OBS_FILE))
+        line_count = TEST_OBS_FILE.read_bytes().count(b"\n")
         print_pass(f"Observations file: {line_count} lines")
         checks.append(True)
     else:
@@ -445,17 +483,18 @@ def verify_pipeline():
 
     # Check 2: Database exists and has entries
     if TEST_DB_PATH.exists():
-        conn = sqlite3.connect(str(TEST_DB_PATH))
-        total = conn.execute("SELECT COUNT(*) FROM knowledge_entries").fetchone()[0]
-        rels = conn.execute("SELECT COUNT(*) FROM knowledge_relations").fetchone()[0]
+        db = conn if conn is not None else open_db()
+        total = db.execute("SELECT COUNT(*) FROM knowledge_entries").fetchone()[0]
+        rels = db.execute("SELECT COUNT(*) FROM knowledge_relations").fetchone()[0]
 
         # Check categories
-        cats = conn.execute(
+        cats = db.execute(
             "SELECT category, COUNT(*) as cnt FROM knowledge_entries GROUP BY category"
         ).fetchall()
         cat_summary = ", ".join(f"{r[0]}={r[1]}" for r in cats)
 
-        conn.close()
+        if db is not conn:
+            db.close()
 
         print_pass(f"Knowledge DB: {total} entries, {rels} relations ({cat_summary})")
         checks.append(True)
@@ -474,10 +513,10 @@ def verify_pipeline():
     for hf in hook_files:
         path = SCRIPT_DIR / hf
         if path.exists():
-            # Basic syntax check
+            # Basic syntax check; compiling the raw bytes lets the compiler
+            # handle decoding (and PEP 263 cookies) without a text wrapper
             try:
-                with open(path, "r") as f:
-                    compile(f.read(), str(path), "exec")
+                compile(path.read_bytes(), str(path), "exec", dont_inherit=True)
                 print_pass(f"Hook script valid: {hf}")
                 checks.append(True)
             except SyntaxError as e:
@@ -523,13 +562,13 @@ def show_stats():
     # Observations
     obs_file = Path.home() / ".claude" / "observations.jsonl"
     if obs_file.exists():
-        total_obs = sum(1 for _ in open(obs_file))
-        processed = 0
-        unprocessed = 0
-        with open(obs_file, "r") as f:
+        # Single streaming pass: count lines and classify them together
+        total_obs = processed = unprocessed = 0
+        with open(obs_file, "rb") as f:
             for line in f:
+                total_obs += 1
                 try:
-                    obs = json.loads(line.strip())
+                    obs = _json_loads(line)
                     if obs.get("processed", False):
                         processed += 1
                     else:
@@ -565,10 +604,10 @@ def show_stats():
     if analysis_log.exists():
         sessions = 0
         last_analysis = None
-        with open(analysis_log, "r") as f:
+        with open(analysis_log, "rb") as f:
             for line in f:
                 try:
-                    entry = json.loads(line.strip())
+                    entry = _json_loads(line)
                     if entry.get("stage") != "learn":
                         sessions += 1
                         last_analysis = entry.get("timestamp", "")
@@ -614,17 +653,22 @@ def main():
         print_fail("Analyze stage failed, stopping")
         sys.exit(1)
 
-    # Step 3: Store learnings
-    if not test_learn(session_id):
-        print_fail("Learn stage failed, stopping")
-        sys.exit(1)
-
-    # Step 4: Inject relevant knowledge
-    if not test_evolve():
-        print_fail("Evolve stage failed")
-
-    # Step 5: Full verification
-    success = verify_pipeline()
+    # Steps 3-5 share one connection so the page cache stays warm
+    conn = open_db()
+    try:
+        # Step 3: Store learnings
+        if not test_learn(session_id, conn):
+            print_fail("Learn stage failed, stopping")
+            sys.exit(1)
+
+        # Step 4: Inject relevant knowledge
+        if not test_evolve(conn):
+            print_fail("Evolve stage failed")
+
+        # Step 5: Full verification
+        success = verify_pipeline(conn)
+    finally:
+        conn.close()
 
     sys.exit(0 if success else 1)
 
@@ -18,6 +18,7 @@ Architecture:
   This avoids the main model burning tokens on translation; it just switches output language.
 """
 
+import hashlib
 import json
 import os
 import re
@@ -26,14 +27,53 @@ from pathlib import Path
 
 KOREAN_RE = re.compile(r"[\uAC00-\uD7A3\u1100-\u11FF\u3130-\u318F\uA960-\uA97F\uD7B0-\uD7FF]")
 FLAG_PATH = Path.home() / ".claude" / "korean_mode"
+CACHE_DIR = Path.home() / ".claude" / "korean_mode_cache"
+
+# Cached translations kept on disk; the oldest are deleted past this count
+CACHE_MAX_ENTRIES = 200
+
+
+# UTF-8 lead bytes of every KOREAN_RE range: Jamo (E1), compatibility Jamo (E3),
+# Jamo Extended-A and syllables (EA-ED)
+KOREAN_LEAD_BYTES = (b"\xe1", b"\xe3", b"\xea", b"\xeb", b"\xec", b"\xed")
 
 
 def has_korean(text: str) -> bool:
+    # isascii() reads the string's cached ASCII flag, so pure-ASCII prompts skip the regex
+    if text.isascii():
+        return False
+    # memchr-backed lead byte probes rule out non-Korean Unicode text cheaply;
+    # the regex only confirms when a candidate lead byte is present
+    raw = text.encode("utf-8", errors="ignore")
+    if not any(lead in raw for lead in KOREAN_LEAD_BYTES):
+        return False
     return bool(KOREAN_RE.search(text))
 
 
+def may_contain_korean(raw: bytes) -> bool:
+    """Cheap byte-level pre-check on the raw hook payload.
+
+    Pure-ASCII input without \\u escapes cannot hold Hangul, however the
+    JSON encoder chose to write it.
+    """
+    return not raw.isascii() or b"\\u" in raw
+
+
 def translate_to_english(text: str) -> str | None:
-    """Translate Korean prompt to English using Haiku."""
+    """Translate Korean prompt to English using Haiku.
+
+    Translations are cached on disk keyed by the prompt's SHA-256, so a
+    repeated prompt skips the SDK import and the API round-trip. Only the
+    CACHE_MAX_ENTRIES most recently written translations are kept.
+    """
+    # surrogatepass: a JSON prompt may carry lone surrogates, which strict UTF-8 rejects
+    key = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+    cache_file = CACHE_DIR / f"{key}.txt"
+    try:
+        return cache_file.read_text(encoding="utf-8")
+    except OSError:
+        pass
+
     try:
         import anthropic
 
@@ -52,10 +92,39 @@ def translate_to_english(text: str) -> str | None:
                 }
             ],
         )
-        return response.content[0].text.strip()
+        translation = response.content[0].text.strip()
     except Exception:
         return None
 
+    if translation:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(translation, encoding="utf-8")
+            tmp.replace(cache_file)
+        except OSError:
+            pass
+        else:
+            prune_cache()
+    return translation
+
+
+def prune_cache() -> None:
+    """Delete the oldest cached translations beyond CACHE_MAX_ENTRIES. Failures are ignored.
+
+    Runs only after a new translation is written, which already paid for
+    an API call, so listing the directory is negligible.
+    """
+    try:
+        files = sorted(CACHE_DIR.glob("*.txt"), key=lambda path: path.stat().st_mtime)
+    except OSError:
+        return
+    for path in files[:-CACHE_MAX_ENTRIES]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
 
 def main():
     # Short-circuit if Korean mode is not enabled
@@ -63,7 +132,8 @@ def main():
         sys.exit(0)
 
     try:
-        input_data = json.load(sys.stdin)
+        raw = sys.stdin.buffer.read()
+        input_data = json.loads(raw)
     except Exception:
         sys.exit(0)
 
@@ -81,7 +151,7 @@ def main():
         "INSTRUCTION: Use Korean for all explanations, code comments, variable names in prose, and summaries.",
     ]
 
-    if has_korean(prompt):
+    if may_contain_korean(raw) and has_korean(prompt):
         english = translate_to_english(prompt)
         if english:
             context_lines.append(
@@ -97,7 +167,10 @@ def main():
             "additionalContext": "\n".join(context_lines),
         }
     }
-    print(json.dumps(output))
+    # Compact UTF-8 keeps Hangul as 3 bytes instead of 6-byte \uXXXX escapes
+    sys.stdout.buffer.write(
+        json.dumps(output, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+    )
 
 
 if __name__ == "__main__":
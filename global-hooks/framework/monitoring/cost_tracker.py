@@ -25,13 +25,32 @@ Usage:
     # As CLI - see model_usage_cli.py
 """
 
+import atexit
+import functools
 import json
+import mmap
 import os
+import sys
+import threading
 import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta, timezone
+from itertools import repeat
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumpb = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumpb(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
 
 # Pricing per 1M tokens (Anthropic 2026)
 MODEL_PRICING = {
@@ -55,12 +74,24 @@ TIER_PATTERNS = [
 
 DEFAULT_LOG_PATH = Path.home() / ".claude" / "logs" / "cost_tracking.jsonl"
 
+# Bytes of log between checkpoints in the sidecar index
+INDEX_STRIDE = 256 * 1024
+
+# record_usage writes epoch_ms right after the fixed-width timestamp member
+_EPOCH_KEY = b'"epoch_ms":'
+_EPOCH_KEY_WITHIN = 96
+
+# Rollup builds over more log than this are split across a process pool
+PARALLEL_SCAN_BYTES = 50 * 1024 * 1024
+
 
+@functools.lru_cache(maxsize=32)
 def resolve_model_tier(model_name: str) -> dict:
     """Resolve a model name string to pricing info.
 
     Tries exact match first, then falls back to pattern matching on the model
     name string. Returns pricing dict with keys: input, output, tier.
+    Results are memoised and shared between callers; treat them as read-only.
     """
     if not model_name:
         return {"input": 3.00, "output": 15.00, "tier": "unknown"}
@@ -80,19 +111,231 @@ def resolve_model_tier(model_name: str) -> dict:
     return {"input": 3.00, "output": 15.00, "tier": "unknown"}
 
 
+@functools.lru_cache(maxsize=256)
+def _static_fields(
+    session_id: str, model: str, tier: str, agent_name: str, event_type: str, tool_name: str
+) -> bytes:
+    """Pre-serialised JSON members for the fields that repeat within a session."""
+    return _json_dumpb({
+        "session_id": session_id,
+        "model": model,
+        "tier": tier,
+        "agent_name": agent_name,
+        "event_type": event_type,
+        "tool_name": tool_name,
+    })[1:-1]
+
+
+_ts_second = (None, "")
+
+
+def _utc_timestamp(epoch_ns: int) -> str:
+    """Format epoch nanoseconds like datetime.isoformat() + "Z" on a UTC datetime.
+
+    The seconds part is formatted with time.strftime once per distinct second
+    and reused, so most events only format their microseconds.
+    """
+    global _ts_second
+    secs, ns = divmod(epoch_ns, 1_000_000_000)
+    cached_secs, prefix = _ts_second
+    if cached_secs != secs:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(secs))
+        _ts_second = (secs, prefix)
+    return f"{prefix}.{ns // 1000:06d}+00:00Z"
+
+
+def _json_int(value) -> str:
+    return str(value) if type(value) is int else json.dumps(value)
+
+
+def _line_epoch_ms(line: bytes) -> Optional[int]:
+    """Return the epoch_ms value of a log line without parsing it as JSON.
+
+    Accepts both compact and default json.dumps spacing. Returns None when
+    epoch_ms is not among the leading members or is not an integer.
+    """
+    i = line.find(_EPOCH_KEY, 0, _EPOCH_KEY_WITHIN)
+    if i < 0:
+        return None
+    i += len(_EPOCH_KEY)
+    j = line.find(b",", i)
+    try:
+        return int(line[i:j])
+    except ValueError:
+        return None
+
+
+def _window_start(maxes: list, offsets: list, since_ms: Optional[int]) -> int:
+    """Byte offset of the earliest index checkpoint that can hold entries from since_ms."""
+    if since_ms is None:
+        return 0
+    # Checkpoint maxima never decrease, so every line before the last
+    # checkpoint still below since_ms is out of the window
+    i = bisect_left(maxes, since_ms)
+    return offsets[i - 1] if i else 0
+
+
+def _epoch_month(epoch_ms: int) -> str:
+    """UTC "YYYY-MM" of an epoch-milliseconds value."""
+    return time.strftime("%Y-%m", time.gmtime(epoch_ms // 1000))
+
+
+def _summarize_range(path: Path, start: int, end: int) -> tuple:
+    """Process-pool worker: (per-day summary states, end offset) for one byte range of a log file."""
+    entries, pos = CostTracker(path)._scan(start=start, end=end, path=path)
+    return CostTracker._rollup_days(entries), pos
+
+
+def _split_range(path: Path, start: int, end: int, pieces: int) -> list:
+    """Newline-aligned boundaries cutting [start, end) of a file into up to ``pieces`` ranges."""
+    bounds = [start]
+    with open(path, "rb") as f:
+        for k in range(1, pieces):
+            f.seek(start + (end - start) * k // pieces)
+            f.readline()
+            cut = min(f.tell(), end)
+            if cut > bounds[-1]:
+                bounds.append(cut)
+    if end > bounds[-1]:
+        bounds.append(end)
+    return bounds
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` via a temp file. Failures are ignored."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        tmp.replace(path)
+    except OSError:
+        pass
+
+
 def calculate_cost(input_tokens: int, output_tokens: int, pricing: dict) -> float:
-    """Calculate cost in USD given token counts and pricing dict."""
-    input_cost = (input_tokens / 1_000_000) * pricing["input"]
-    output_cost = (output_tokens / 1_000_000) * pricing["output"]
-    return round(input_cost + output_cost, 6)
+    """Calculate cost in USD given token counts and pricing dict.
+
+    Prices are per 1M tokens, so tokens * price is the cost in micro-USD.
+    Rounding that to an integer once gives the 6-decimal USD value without
+    accumulating error from the per-term divisions.
+    """
+    micro_usd = round(input_tokens * pricing["input"] + output_tokens * pricing["output"])
+    return micro_usd / 1_000_000
+
+
+LOG_BUFFER_SIZE = 64 * 1024
+
+# Longest a buffered line waits for the background writer
+LOG_FLUSH_INTERVAL = 0.05
+
+# Unwritten bytes beyond which new lines are dropped instead of queued
+LOG_BUFFER_LIMIT = 4 * 1024 * 1024
 
 
 class CostTracker:
-    """Tracks model usage costs by logging to a JSONL file."""
+    """Tracks model usage costs by logging to a JSONL file.
+
+    Events are appended to ``log_path``, which other tools (orch-shared and
+    the Rust SubagentStop hook) read and write directly. Monthly
+    ``<stem>_YYYY-MM<suffix>`` files beside it, written by earlier versions,
+    are still read when their month overlaps a query window.
+
+    record_usage only appends the encoded line to a bytearray; a daemon
+    writer thread swaps that buffer out and writes it once LOG_BUFFER_SIZE
+    is reached or LOG_FLUSH_INTERVAL has passed, so callers never wait on
+    the filesystem. Only whole lines are ever written, so concurrent
+    appenders cannot interleave inside a line. Buffered lines also reach
+    disk on flush(), close(), any read through this tracker, or interpreter exit.
+    """
 
     def __init__(self, log_path: Optional[Path] = None):
         self.log_path = log_path or DEFAULT_LOG_PATH
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        # _lock guards the buffers; _write_lock serialises drains so chunks
+        # reach disk in the order they were swapped out
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._buf = bytearray()
+        self._spare = bytearray()
+        self._fh = None
+        self._writer = None
+        self._atexit_registered = False
+
+    def _drain(self) -> None:
+        """Write every buffered line to the log."""
+        with self._write_lock:
+            with self._lock:
+                data = self._buf
+                if not data:
+                    return
+                self._buf = self._spare
+            try:
+                if self._fh is None:
+                    # Unbuffered: the bytearrays are the only buffer
+                    self._fh = open(self.log_path, "ab", buffering=0)
+                view = memoryview(data)
+                while view:
+                    view = view[self._fh.write(view):]
+                view.release()
+            except IOError as e:
+                # Fail silently - cost tracking should never block operations
+                print(f"Cost tracker write error: {e}", file=sys.stderr)
+            data.clear()
+            # Keep the written buffer for reuse by the next swap
+            self._spare = data
+
+    def _run_writer(self) -> None:
+        """Background writer: drain the buffer in batches until replaced or closed."""
+        me = threading.current_thread()
+        while True:
+            with self._ready:
+                while self._writer is me and not self._buf:
+                    self._ready.wait()
+                if self._writer is not me:
+                    return
+                # Let a batch build up unless the buffer is already full
+                if len(self._buf) < LOG_BUFFER_SIZE:
+                    self._ready.wait(LOG_FLUSH_INTERVAL)
+            self._drain()
+
+    def _partition_path(self, month: str) -> Path:
+        """Monthly log file of a "YYYY-MM" month, as written by earlier versions."""
+        return self.log_path.with_name(f"{self.log_path.stem}_{month}{self.log_path.suffix}")
+
+    def _window_files(self, since_ms: Optional[int], until_ms: Optional[int]) -> list:
+        """Log files that can hold entries in [since_ms, until_ms].
+
+        ``log_path`` comes first, then the monthly files in month order.
+        """
+        first = _epoch_month(since_ms) if since_ms is not None else ""
+        last = _epoch_month(until_ms) if until_ms is not None else "9999-99"
+        # "????-??" pins the month to seven characters, and the .idx and
+        # .days.json sidecars and .tmp files do not end in the log suffix,
+        # so every match is one month's partition
+        prefix = len(self.log_path.stem) + 1
+        months = sorted(
+            path.name[prefix:prefix + 7]
+            for path in self.log_path.parent.glob(f"{self.log_path.stem}_????-??{self.log_path.suffix}")
+        )
+        files = [self.log_path] if self.log_path.exists() else []
+        files.extend(self._partition_path(month) for month in months if first <= month <= last)
+        return files
+
+    def flush(self) -> None:
+        """Write any buffered log lines to disk."""
+        self._drain()
+
+    def close(self) -> None:
+        """Stop the writer, flush, and close the append handle. Safe to call more than once."""
+        with self._ready:
+            self._writer = None
+            self._ready.notify()
+        self._drain()
+        with self._write_lock:
+            if self._fh is not None:
+                fh, self._fh = self._fh, None
+                fh.close()
 
     def record_usage(
         self,
@@ -104,17 +347,20 @@ class CostTracker:
         event_type: str = "",
         tool_name: str = "",
         metadata: Optional[dict] = None,
+        flush: bool = False,
     ) -> dict:
         """Record a single usage event to the cost tracking log.
 
+        Pass flush=True to push the line to disk before returning.
         Returns the entry that was written.
         """
         pricing = resolve_model_tier(model)
         cost = calculate_cost(input_tokens, output_tokens, pricing)
 
+        now_ns = time.time_ns()
         entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
-            "epoch_ms": int(time.time() * 1000),
+            "timestamp": _utc_timestamp(now_ns),
+            "epoch_ms": now_ns // 1_000_000,
             "session_id": session_id,
             "model": model,
             "tier": pricing["tier"],
@@ -126,17 +372,45 @@ class CostTracker:
             "tool_name": tool_name,
         }
 
+        # Only the per-event values are serialised here; the session-level
+        # members come pre-encoded from _static_fields. timestamp stays first.
+        # cost is always a float, whose repr is its JSON encoding, and int
+        # token counts format as JSON directly.
+        if type(input_tokens) is not int or type(output_tokens) is not int:
+            input_tokens, output_tokens = _json_int(input_tokens), _json_int(output_tokens)
+        head = (
+            f'{{"timestamp":"{entry["timestamp"]}","epoch_ms":{entry["epoch_ms"]},'
+            f'"input_tokens":{input_tokens},"output_tokens":{output_tokens},'
+            f'"cost_usd":{cost!r},'
+        ).encode()
+        static = _static_fields(session_id, model, pricing["tier"], agent_name, event_type, tool_name)
         if metadata:
             entry["metadata"] = metadata
-
-        try:
-            with open(self.log_path, "a") as f:
-                f.write(json.dumps(entry) + "\n")
-        except IOError as e:
-            # Fail silently - cost tracking should never block operations
-            import sys
-            print(f"Cost tracker write error: {e}", file=sys.stderr)
-
+            line = b"".join((head, static, b',"metadata":', _json_dumpb(metadata), b"}\n"))
+        else:
+            line = b"".join((head, static, b"}\n"))
+
+        # The raw lock is the condition's lock; entering it directly skips
+        # Condition.__enter__, and notify() below still sees it held
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._run_writer, name="cost-tracker-writer", daemon=True
+                )
+                self._writer.start()
+                if not self._atexit_registered:
+                    atexit.register(self.close)
+                    self._atexit_registered = True
+            if len(self._buf) >= LOG_BUFFER_LIMIT:
+                print("Cost tracker buffer full, dropping event", file=sys.stderr)
+                return entry
+            was_empty = not self._buf
+            self._buf += line
+            if was_empty or len(self._buf) >= LOG_BUFFER_SIZE:
+                self._ready.notify()
+
+        if flush:
+            self._drain()
         return entry
 
     def read_entries(
@@ -148,29 +422,119 @@ class CostTracker:
         agent_name: Optional[str] = None,
     ) -> list:
         """Read and filter entries from the cost tracking log."""
-        if not self.log_path.exists():
-            return []
+        self.flush()
+        entries = []
+        since_ms = int(since.timestamp() * 1000) if since else None
+        until_ms = int(until.timestamp() * 1000) if until else None
+        for path in self._window_files(since_ms, until_ms):
+            entries += self._scan(since, until, tier, session_id, agent_name, path=path)[0]
+        return entries
+
+    def _scan(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        tier: Optional[str] = None,
+        session_id: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        path: Optional[Path] = None,
+    ) -> tuple:
+        """Scan one log file (``log_path`` by default) and return (entries, end_offset).
+
+        Reading begins at byte ``start`` when given, otherwise at the earliest
+        index checkpoint that can hold entries from ``since``, and stops at the
+        first line starting at or after ``end`` when given. ``end_offset``
+        is the offset just past the last complete line read; an unterminated
+        final line is treated as a write still in progress and skipped.
+        """
+        # Make this tracker's own buffered writes visible to the read
+        self.flush()
+        path = path or self.log_path
+        if not path.exists():
+            return [], 0
 
         entries = []
-        since_iso = since.isoformat() + "Z" if since else None
-        until_iso = until.isoformat() + "Z" if until else None
+        # Windows compare on the integer epoch_ms; the ISO timestamp is only
+        # kept in the log for readability
+        since_ms = int(since.timestamp() * 1000) if since else None
+        until_ms = int(until.timestamp() * 1000) if until else None
+        prefilter = since_ms is not None or until_ms is not None
 
         try:
-            with open(self.log_path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
+            st = path.stat()
+            if not st.st_size:
+                return [], 0
+            maxes, offsets, indexed_end, running_max = self._load_index(path, st)
+            old_end = indexed_end
+
+            if start is None:
+                if (since_ms is not None and indexed_end == st.st_size
+                        and running_max < since_ms):
+                    # Fully indexed and entirely older than the window
+                    return [], st.st_size
+                start = _window_start(maxes, offsets, since_ms)
+            last_checkpoint = offsets[-1] if offsets else 0
+
+            # Map the log read-only: lines are sliced straight from the page
+            # cache instead of being copied through a read() buffer
+            with open(path, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                mm.seek(start)
+                pos = start
+                for line in iter(mm.readline, b""):
+                    if end is not None and pos >= end:
+                        break
+                    if not line.endswith(b"\n"):
+                        break
+                    line_start = pos
+                    pos += len(line)
+
+                    # Reject out-of-window lines from their epoch_ms bytes
+                    # alone; lines the index has not covered yet are always
+                    # parsed so their epoch_ms can be recorded
+                    if prefilter and line_start < indexed_end:
+                        epoch_ms = _line_epoch_ms(line)
+                        if epoch_ms is not None and (
+                            (since_ms is not None and epoch_ms < since_ms)
+                            or (until_ms is not None and epoch_ms > until_ms)
+                        ):
+                            continue
+
+                    # Both parsers accept the trailing newline; other blank
+                    # or whitespace-only lines raise and are dropped below
                     try:
-                        entry = json.loads(line)
-                    except json.JSONDecodeError:
+                        entry = _json_loads(line) if line != b"\n" else None
+                    except ValueError:
+                        entry = None
+
+                    if entry is not None:
+                        epoch_ms = entry.get("epoch_ms")
+                        if not isinstance(epoch_ms, int):
+                            epoch_ms = None
+
+                    # Extend the index over lines it has not seen yet; only a
+                    # contiguous read from indexed_end keeps running_max exact
+                    if line_start == indexed_end:
+                        if entry is not None:
+                            # Undated entries must never be skipped
+                            line_max = sys.maxsize if epoch_ms is None else epoch_ms
+                            if line_max > running_max:
+                                running_max = line_max
+                        indexed_end = pos
+                        if pos - last_checkpoint >= INDEX_STRIDE:
+                            maxes.append(running_max)
+                            offsets.append(pos)
+                            last_checkpoint = pos
+
+                    if entry is None:
                         continue
 
                     # Apply filters
-                    ts = entry.get("timestamp", "")
-                    if since_iso and ts < since_iso:
+                    if since_ms is not None and (epoch_ms is None or epoch_ms < since_ms):
                         continue
-                    if until_iso and ts > until_iso:
+                    if until_ms is not None and (epoch_ms is None or epoch_ms > until_ms):
                         continue
                     if tier and entry.get("tier") != tier:
                         continue
@@ -180,10 +544,155 @@ class CostTracker:
                         continue
 
                     entries.append(entry)
-        except IOError:
-            return []
+        except (IOError, ValueError):
+            return [], 0
 
-        return entries
+        if indexed_end != old_end:
+            self._save_index(path, st.st_ino, maxes, offsets, indexed_end, running_max)
+
+        return entries, pos
+
+    @staticmethod
+    def _index_path(path: Path) -> Path:
+        """Sidecar index of (max epoch_ms before offset, byte offset) checkpoints."""
+        return path.with_suffix(".idx")
+
+    def _load_index(self, path: Path, st: os.stat_result) -> tuple:
+        """Load the sidecar index for the log file at ``path`` described by ``st``.
+
+        Returns (maxes, offsets, indexed_end, running_max). An index that is
+        missing, unreadable, or written for a different or truncated log file
+        is treated as empty and rebuilt by the next read.
+        """
+        try:
+            with open(self._index_path(path), "r") as f:
+                ino, indexed_end, running_max = map(int, f.readline().split())
+                if ino != st.st_ino or indexed_end > st.st_size:
+                    return [], [], 0, -1
+                maxes, offsets = [], []
+                for line in f:
+                    max_ms, offset = line.split()
+                    maxes.append(int(max_ms))
+                    offsets.append(int(offset))
+            return maxes, offsets, indexed_end, running_max
+        except (OSError, ValueError):
+            return [], [], 0, -1
+
+    def _save_index(
+        self, path: Path, ino: int, maxes: list, offsets: list, indexed_end: int, running_max: int
+    ) -> None:
+        """Atomically replace the sidecar index of ``path``. Failures are ignored."""
+        _atomic_write(self._index_path(path), (
+            f"{ino} {indexed_end} {running_max}\n"
+            + "".join(f"{m} {o}\n" for m, o in zip(maxes, offsets))
+        ).encode())
+
+    @staticmethod
+    def _rollup_path(path: Path) -> Path:
+        """Sidecar holding the per-UTC-day unrounded summary states of a log file."""
+        return path.with_suffix(".days.json")
+
+    def _load_rollup(self, path: Path) -> dict:
+        """Per-day summary states of the log file at ``path``, keyed "YYYY-MM-DD".
+
+        Entries without an integer epoch_ms are kept under "". The sidecar
+        records the byte offset it covers, so only lines appended since the
+        last call are parsed; it is rebuilt when the file is replaced or
+        truncated.
+        """
+        try:
+            st = path.stat()
+        except OSError:
+            return {}
+        rollup = None
+        try:
+            with open(self._rollup_path(path), "rb") as f:
+                cached = _json_loads(f.read())
+            if cached["ino"] == st.st_ino and cached["offset"] <= st.st_size:
+                rollup = cached
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        if rollup is None:
+            rollup = {"ino": st.st_ino, "offset": 0, "days": {}}
+
+        start = rollup["offset"]
+        if start < st.st_size:
+            offset = start
+            for days, end in self._summarize_span(path, start, st.st_size):
+                if end < offset:
+                    # A range failed to read; keep the result but not the cache
+                    offset = None
+                    break
+                self._merge_days(rollup["days"], days)
+                offset = end
+            if offset is not None and offset != start:
+                rollup["offset"] = offset
+                _atomic_write(self._rollup_path(path), _json_dumpb(rollup))
+        return rollup["days"]
+
+    def _summarize_span(self, path: Path, start: int, end: int) -> list:
+        """Per-day states of [start, end) as a list of (days, end_offset) pieces in file order.
+
+        Spans over PARALLEL_SCAN_BYTES are split across a process pool when
+        more than one CPU is available. Workers return summary states rather
+        than entries: shipping parsed entries back to the parent costs more
+        than parsing them here.
+        """
+        workers = os.cpu_count() or 1
+        if workers > 1 and end - start >= PARALLEL_SCAN_BYTES:
+            try:
+                bounds = _split_range(path, start, end, workers)
+                with ProcessPoolExecutor(len(bounds) - 1) as pool:
+                    return list(pool.map(_summarize_range, repeat(path), bounds[:-1], bounds[1:]))
+            except (OSError, BrokenProcessPool):
+                pass
+        entries, pos = self._scan(start=start, path=path)
+        return [(self._rollup_days(entries), pos)]
+
+    @classmethod
+    def _rollup_days(cls, entries: list) -> dict:
+        """Accumulate entries into per-UTC-day summary states, in file order within each day."""
+        by_day = {}
+        names = {}
+        for entry in entries:
+            epoch_ms = entry.get("epoch_ms")
+            if isinstance(epoch_ms, int):
+                day = epoch_ms // 86_400_000
+                name = names.get(day)
+                if name is None:
+                    name = names[day] = time.strftime("%Y-%m-%d", time.gmtime(day * 86_400))
+            else:
+                name = ""
+            day_entries = by_day.get(name)
+            if day_entries is None:
+                day_entries = by_day[name] = []
+            day_entries.append(entry)
+
+        days = {}
+        for name, day_entries in by_day.items():
+            state = days[name] = cls._new_summary_state()
+            cls._accumulate_summary(state, day_entries)
+        return days
+
+    @classmethod
+    def _merge_days(cls, days: dict, other: dict) -> None:
+        """Merge per-day states from ``other`` into ``days`` in place."""
+        for name, state in other.items():
+            mine = days.get(name)
+            if mine is None:
+                days[name] = state
+            else:
+                cls._merge_summary(mine, state)
+
+    def _day_states(self, since_ms: Optional[int], until_ms: Optional[int]) -> dict:
+        """Per-day states merged across the log files that can hold [since_ms, until_ms]."""
+        # Lines still queued for the writer must reach disk before the log
+        # files are listed and the rollups compare their sizes
+        self.flush()
+        days = {}
+        for path in self._window_files(since_ms, until_ms):
+            self._merge_days(days, self._load_rollup(path))
+        return days
 
     def get_summary(self, period: str = "today") -> dict:
         """Get a cost summary for a time period.
@@ -195,14 +704,10 @@ class CostTracker:
             Dictionary with cost breakdown by tier, agent, and totals.
         """
         now = datetime.now(timezone.utc)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        if period == "today":
-            since = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif period == "yesterday":
-            since = (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            until = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            entries = self.read_entries(since=since, until=until)
-            return self._build_summary(entries, period)
+        if period == "yesterday":
+            return self._window_summary(today_start - timedelta(days=1), today_start, period)
         elif period == "week":
             since = now - timedelta(days=7)
         elif period == "month":
@@ -210,10 +715,37 @@ class CostTracker:
         elif period == "all":
             since = None
         else:
-            since = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            since = today_start
+
+        return self._window_summary(since, None, period)
 
-        entries = self.read_entries(since=since)
-        return self._build_summary(entries, period)
+    def _window_summary(self, since: Optional[datetime], until: Optional[datetime], period: str) -> dict:
+        """Summarise [since, until) from the per-day rollups.
+
+        ``until`` must be a UTC midnight. Whole days come from the rollups;
+        only the part of the first day from ``since`` onward is scanned.
+        """
+        state = self._new_summary_state()
+        since_ms = int(since.timestamp() * 1000) if since else None
+        until_ms = int(until.timestamp() * 1000) if until else None
+
+        first = ""
+        if since is not None:
+            day = since.replace(hour=0, minute=0, second=0, microsecond=0)
+            if day != since:
+                day += timedelta(days=1)
+                edge_end = min(day, until) if until else day
+                partial = self.read_entries(since=since, until=edge_end - timedelta(milliseconds=1))
+                self._accumulate_summary(state, partial)
+            first = day.strftime("%Y-%m-%d")
+        last = (until - timedelta(days=1)).strftime("%Y-%m-%d") if until else "9999-99-99"
+
+        days = self._day_states(since_ms, until_ms - 1 if until_ms is not None else None)
+        for name in sorted(days):
+            # "" holds undated entries, which only an unbounded window includes
+            if (name or since is None) and first <= name <= last:
+                self._merge_summary(state, days[name])
+        return self._finalize_summary(state, period)
 
     def get_daily_breakdown(self, days: int = 7) -> list:
         """Get cost breakdown by day for the last N days.
@@ -221,16 +753,16 @@ class CostTracker:
         Returns list of daily summaries, most recent first.
         """
         now = datetime.now(timezone.utc)
-        daily = []
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        day0 = today_start - timedelta(days=days - 1)
 
+        states = self._day_states(int(day0.timestamp() * 1000), None)
+
+        daily = []
         for i in range(days):
-            day_start = (now - timedelta(days=i)).replace(
-                hour=0, minute=0, second=0, microsecond=0
-            )
-            day_end = day_start + timedelta(days=1)
-            entries = self.read_entries(since=day_start, until=day_end)
-            summary = self._build_summary(entries, day_start.strftime("%Y-%m-%d"))
-            summary["date"] = day_start.strftime("%Y-%m-%d")
+            date = (today_start - timedelta(days=i)).strftime("%Y-%m-%d")
+            summary = self._finalize_summary(states.get(date) or self._new_summary_state(), date)
+            summary["date"] = date
             daily.append(summary)
 
         return daily
@@ -288,72 +820,108 @@ class CostTracker:
             "tier_breakdown": tier_breakdown,
         }
 
-    def _build_summary(self, entries: list, period: str) -> dict:
-        """Build a cost summary from a list of entries."""
-        by_tier = {}
-        by_agent = {}
-        by_session = {}
-        total_cost = 0.0
-        total_input = 0
-        total_output = 0
-        event_count = len(entries)
+    @staticmethod
+    def _new_summary_state() -> dict:
+        """Return an empty, unrounded summary accumulator (JSON-serialisable)."""
+        return {
+            "total_cost": 0.0,
+            "total_input_tokens": 0,
+            "total_output_tokens": 0,
+            "event_count": 0,
+            "by_tier": {},
+            "by_agent": {},
+            "by_session": {},
+        }
 
+    @staticmethod
+    def _accumulate_summary(state: dict, entries: list) -> None:
+        """Fold entries into an accumulator from _new_summary_state in place."""
+        by_tier = state["by_tier"]
+        by_agent = state["by_agent"]
+        by_session = state["by_session"]
+        total_cost = state["total_cost"]
+        total_input = state["total_input_tokens"]
+        total_output = state["total_output_tokens"]
+
+        # Each group dict is looked up once per entry and updated in place
         for entry in entries:
-            tier = entry.get("tier", "unknown")
-            agent = entry.get("agent_name", "unknown") or "unknown"
-            session = entry.get("session_id", "unknown")
-            cost = entry.get("cost_usd", 0.0)
-            inp = entry.get("input_tokens", 0)
-            out = entry.get("output_tokens", 0)
+            get = entry.get
+            tier = get("tier", "unknown")
+            agent = get("agent_name", "unknown") or "unknown"
+            session = get("session_id", "unknown")
+            cost = get("cost_usd", 0.0)
+            inp = get("input_tokens", 0)
+            out = get("output_tokens", 0)
 
             total_cost += cost
             total_input += inp
             total_output += out
 
             # By tier
-            if tier not in by_tier:
-                by_tier[tier] = {"cost": 0.0, "input_tokens": 0, "output_tokens": 0, "events": 0}
-            by_tier[tier]["cost"] += cost
-            by_tier[tier]["input_tokens"] += inp
-            by_tier[tier]["output_tokens"] += out
-            by_tier[tier]["events"] += 1
+            t = by_tier.get(tier)
+            if t is None:
+                t = by_tier[tier] = {"cost": 0.0, "input_tokens": 0, "output_tokens": 0, "events": 0}
+            t["cost"] += cost
+            t["input_tokens"] += inp
+            t["output_tokens"] += out
+            t["events"] += 1
 
             # By agent
-            if agent not in by_agent:
-                by_agent[agent] = {"cost": 0.0, "input_tokens": 0, "output_tokens": 0, "events": 0, "tier": tier}
-            by_agent[agent]["cost"] += cost
-            by_agent[agent]["input_tokens"] += inp
-            by_agent[agent]["output_tokens"] += out
-            by_agent[agent]["events"] += 1
+            a = by_agent.get(agent)
+            if a is None:
+                a = by_agent[agent] = {"cost": 0.0, "input_tokens": 0, "output_tokens": 0, "events": 0, "tier": tier}
+            a["cost"] += cost
+            a["input_tokens"] += inp
+            a["output_tokens"] += out
+            a["events"] += 1
 
             # By session
-            if session not in by_session:
-                by_session[session] = {"cost": 0.0, "events": 0}
-            by_session[session]["cost"] += cost
-            by_session[session]["events"] += 1
-
-        # Round costs
-        total_cost = round(total_cost, 6)
-        for tier_data in by_tier.values():
-            tier_data["cost"] = round(tier_data["cost"], 6)
-        for agent_data in by_agent.values():
-            agent_data["cost"] = round(agent_data["cost"], 6)
-        for session_data in by_session.values():
-            session_data["cost"] = round(session_data["cost"], 6)
-
+            sess = by_session.get(session)
+            if sess is None:
+                sess = by_session[session] = {"cost": 0.0, "events": 0}
+            sess["cost"] += cost
+            sess["events"] += 1
+
+        state["total_cost"] = total_cost
+        state["total_input_tokens"] = total_input
+        state["total_output_tokens"] = total_output
+        state["event_count"] += len(entries)
+
+    @staticmethod
+    def _merge_summary(state: dict, other: dict) -> None:
+        """Add another accumulator's totals and groups into state in place."""
+        for key in ("total_cost", "total_input_tokens", "total_output_tokens", "event_count"):
+            state[key] += other[key]
+        for group in ("by_tier", "by_agent", "by_session"):
+            groups = state[group]
+            for name, data in other[group].items():
+                mine = groups.get(name)
+                if mine is None:
+                    groups[name] = data
+                    continue
+                for key, value in data.items():
+                    if key != "tier":
+                        mine[key] += value
+
+    @staticmethod
+    def _finalize_summary(state: dict, period: str) -> dict:
+        """Build the public summary from an accumulator, rounding costs on copies."""
+        def rounded(groups: dict) -> dict:
+            return {k: {**v, "cost": round(v["cost"], 6)} for k, v in groups.items()}
+
+        by_session = rounded(state["by_session"])
         return {
             "period": period,
-            "total_cost": total_cost,
-            "total_input_tokens": total_input,
-            "total_output_tokens": total_output,
-            "event_count": event_count,
-            "by_tier": by_tier,
-            "by_agent": by_agent,
+            "total_cost": round(state["total_cost"], 6),
+            "total_input_tokens": state["total_input_tokens"],
+            "total_output_tokens": state["total_output_tokens"],
+            "event_count": state["event_count"],
+            "by_tier": rounded(state["by_tier"]),
+            "by_agent": rounded(state["by_agent"]),
             "by_session": by_session,
             "session_count": len(by_session),
         }
 
-
 def generate_sample_data(days: int = 7) -> None:
     """Generate sample cost tracking data for testing and projection demos.
 
@@ -378,9 +946,18 @@ def generate_sample_data(days: int = 7) -> None:
     }
 
     sessions_per_day = [3, 5, 4, 2, 6, 4, 3]  # Vary by day
+    event_types = ["PostToolUse", "SubagentStop", "PreToolUse"]
+    tool_names = ["Bash", "Read", "Write", "Edit", "Grep", "Task"]
+    work_seconds = range(8 * 3600, 23 * 3600)
+    choices = random.choices
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    lines = []
 
     for day_offset in range(days):
         day = now - timedelta(days=days - 1 - day_offset)
+        # Midnight of the sample day (keeping now's microseconds), in epoch ns
+        midnight = day.replace(hour=0, minute=0, second=0)
+        day_ns = (midnight - epoch) // timedelta(microseconds=1) * 1000
         num_sessions = sessions_per_day[day_offset % len(sessions_per_day)]
 
         for s in range(num_sessions):
@@ -393,46 +970,50 @@ def generate_sample_data(days: int = 7) -> None:
 
             for agent_name in active_agents:
                 profile = agent_profiles[agent_name]
+                pricing = resolve_model_tier(profile["model"])
                 num_calls = max(1, int(profile["avg_calls"] * random.uniform(0.3, 1.5)))
 
-                for _ in range(num_calls):
-                    input_tokens = random.randint(*profile["input_range"])
-                    output_tokens = random.randint(*profile["output_range"])
-
-                    # Create entry with correct timestamp for the day
-                    hour = random.randint(8, 22)
-                    minute = random.randint(0, 59)
-                    ts = day.replace(hour=hour, minute=minute, second=random.randint(0, 59))
-
-                    pricing = resolve_model_tier(profile["model"])
-                    cost = calculate_cost(input_tokens, output_tokens, pricing)
-
+                # Draw every variate for this agent's calls up front, one
+                # choices() call per column instead of one call per value
+                in_lo, in_hi = profile["input_range"]
+                out_lo, out_hi = profile["output_range"]
+                columns = zip(
+                    choices(range(in_lo, in_hi + 1), k=num_calls),
+                    choices(range(out_lo, out_hi + 1), k=num_calls),
+                    choices(work_seconds, k=num_calls),
+                    choices(event_types, k=num_calls),
+                    choices(tool_names, k=num_calls),
+                )
+
+                for input_tokens, output_tokens, second, event_type, tool_name in columns:
+                    # Same clock time on the sample day, 08:00:00-22:59:59
+                    epoch_ns = day_ns + second * 1_000_000_000
                     entry = {
-                        "timestamp": ts.isoformat() + "Z",
-                        "epoch_ms": int(ts.timestamp() * 1000),
+                        "timestamp": _utc_timestamp(epoch_ns),
+                        "epoch_ms": epoch_ns // 1_000_000,
                         "session_id": session_id,
                         "model": profile["model"],
                         "tier": profile["tier"],
                         "input_tokens": input_tokens,
                         "output_tokens": output_tokens,
-                        "cost_usd": cost,
+                        "cost_usd": calculate_cost(input_tokens, output_tokens, pricing),
                         "agent_name": agent_name,
-                        "event_type": random.choice(["PostToolUse", "SubagentStop", "PreToolUse"]),
-                        "tool_name": random.choice(["Bash", "Read", "Write", "Edit", "Grep", "Task"]),
+                        "event_type": event_type,
+                        "tool_name": tool_name,
                     }
 
-                    try:
-                        with open(tracker.log_path, "a") as f:
-                            f.write(json.dumps(entry) + "\n")
-                    except IOError:
-                        pass
+                    lines.append(_json_dumpb(entry))
+
+    try:
+        with open(tracker.log_path, "ab") as f:
+            f.write(b"\n".join(lines) + b"\n")
+    except IOError:
+        pass
 
     print(f"Generated {days} days of sample data at {tracker.log_path}")
 
 
 if __name__ == "__main__":
-    import sys
-
     if len(sys.argv) > 1 and sys.argv[1] == "--generate-sample":
         days = int(sys.argv[2]) if len(sys.argv) > 2 else 7
         generate_sample_data(days)
@@ -23,6 +23,19 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 from cost_tracker import CostTracker, generate_sample_data
 
+try:
+    import orjson
+
+    def print_json(obj) -> None:
+        """Print obj as indented JSON."""
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        sys.stdout.buffer.flush()
+except ImportError:
+    def print_json(obj) -> None:
+        """Print obj as indented JSON."""
+        print(json.dumps(obj, indent=2))
+
 
 def format_cost(cost: float) -> str:
     """Format cost as USD string."""
@@ -234,14 +247,14 @@ Examples:
     elif args.daily:
         daily = tracker.get_daily_breakdown(args.daily)
         if args.json:
-            print(json.dumps(daily, indent=2))
+            print_json(daily)
         else:
             print_daily_breakdown(daily)
         return
     elif args.projection:
         proj = tracker.get_projection(args.projection)
         if args.json:
-            print(json.dumps(proj, indent=2))
+            print_json(proj)
         else:
             print_projection(proj)
         return
@@ -251,7 +264,7 @@ Examples:
     summary = tracker.get_summary(period)
 
     if args.json:
-        print(json.dumps(summary, indent=2))
+        print_json(summary)
     else:
         print_summary(summary, verbose=args.by_agent)
 
@@ -15,8 +15,10 @@ import sys
 import os
 import subprocess
 import platform
+import random
 
 VOICE_ENABLED = os.environ.get("VOICE_NOTIFICATIONS", "true").lower() == "true"
+IS_MACOS = platform.system() == "Darwin"
 
 DONE_MESSAGES = [
     "Done.",
@@ -27,9 +29,7 @@ DONE_MESSAGES = [
 
 
 def speak(message: str):
-    if not VOICE_ENABLED:
-        return
-    if platform.system() != "Darwin":
+    if not VOICE_ENABLED or not IS_MACOS:
         return
     try:
         subprocess.Popen(
@@ -43,6 +43,10 @@ def speak(message: str):
 
 
 def main():
+    # Nothing will be spoken, so skip reading the payload at all
+    if not VOICE_ENABLED or not IS_MACOS:
+        sys.exit(0)
+
     try:
         hook_input = json.load(sys.stdin)
     except Exception:
@@ -53,7 +57,6 @@ def main():
     if stop_reason in ("error", "cancelled"):
         sys.exit(0)
 
-    import random
     speak(random.choice(DONE_MESSAGES))
     sys.exit(0)
 
@@ -5,7 +5,10 @@ Review Analyzers
 Pluggable analysis modules for the continuous review system.
 Each analyzer implements a common interface:
 
-    def analyze(diff_text: str, changed_files: list[str], repo_root: str) -> list[Finding]
+    def analyze(diff_text: str, changed_files: list[str], repo_root: str) -> Iterable[Finding]
+
+Most analyzers return a list; architecture yields findings lazily so the
+review engine's per-analyzer cap can end its scan early.
 
 Available analyzers:
 - duplication   - Token-based similarity detection
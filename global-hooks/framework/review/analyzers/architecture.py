@@ -16,13 +16,19 @@ Checks:
 Rules are configurable via review_config.yaml.
 """
 
+import ast
+import functools
+import os
 import re
 import sys
+from bisect import bisect_right
+from itertools import accumulate
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from findings_store import Finding, Severity
+from source_cache import read_file_safe
 
 
 # ---------------------------------------------------------------------------
@@ -30,9 +36,32 @@ from findings_store import Finding, Severity
 # ---------------------------------------------------------------------------
 
 
+# Escapes such as \S or \B and mixed-case ranges such as A-z change meaning
+# when a pattern's source is lowercased.
+_UNFOLDABLE_RE = re.compile(r'\\[A-Z]|[A-Z]-[a-z]|[a-z]-[A-Z]')
+
+
+def _ascii_folded(pattern: re.Pattern) -> Optional[re.Pattern]:
+    """
+    Case-sensitive twin of an IGNORECASE pattern, for lowercased ASCII text.
+
+    Lowercasing an ASCII line once and matching it case-sensitively is
+    cheaper than IGNORECASE matching in the regex engine. Returns None when
+    the pattern is case-sensitive or cannot be lowercased safely.
+    """
+    if not pattern.flags & re.IGNORECASE or _UNFOLDABLE_RE.search(pattern.pattern):
+        return None
+    return re.compile(pattern.pattern.lower(), pattern.flags & ~re.IGNORECASE)
+
+
 class ArchRule:
     """A single architecture rule."""
 
+    __slots__ = (
+        "name", "description", "pattern", "severity",
+        "file_filter", "file_exclude", "suggestion", "title", "ascii_folded",
+    )
+
     def __init__(
         self,
         name: str,
@@ -50,6 +79,8 @@ class ArchRule:
         self.file_filter = file_filter      # Only apply to matching files
         self.file_exclude = file_exclude    # Skip matching files
         self.suggestion = suggestion
+        self.title = f"{name}: {description}"  # Title of this rule's findings
+        self.ascii_folded = _ascii_folded(pattern)
 
     def applies_to(self, file_path: str) -> bool:
         """Check if this rule applies to the given file."""
@@ -61,8 +92,10 @@ class ArchRule:
 
 
 # Default architecture rules
-DEFAULT_RULES = [
-    # Security: hardcoded secrets
+DEFAULT_RULES = (
+    # Security: hardcoded secrets. Deliberately not MULTILINE, so analyze()
+    # searches it line by line: its long minimum match width lets the regex
+    # engine reject short lines outright, which beats one buffer scan.
     ArchRule(
         name="hardcoded-secret",
         description="Potential hardcoded secret or API key",
@@ -148,7 +181,7 @@ DEFAULT_RULES = [
         description="Technical debt marker found in new code",
         pattern=re.compile(
             r'#\s*(?:TODO|FIXME|HACK|XXX|TEMP|TEMPORARY)\b',
-            re.IGNORECASE,
+            re.IGNORECASE | re.MULTILINE,
         ),
         severity=Severity.INFO.value,
         suggestion=(
@@ -184,7 +217,30 @@ DEFAULT_RULES = [
         file_exclude=re.compile(r'(?:test|spec|\.test\.|\.spec\.)', re.IGNORECASE),
         suggestion="Use a proper logging library instead of console.log() in production code.",
     ),
-]
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _rules_for_suffix(suffix: str) -> tuple[ArchRule, ...]:
+    """
+    Default line rules whose file filter accepts files ending in suffix.
+
+    Every default file_filter is anchored on the extension, so this is
+    decided once per suffix. file_exclude patterns look at the whole path
+    and are still checked per file.
+    """
+    probe = f"x{suffix}"
+    return tuple(
+        rule for rule in DEFAULT_RULES
+        if rule.name != "god-module"  # Handled separately in analyze()
+        and (not rule.file_filter or rule.file_filter.search(probe))
+    )
+
+
+def _file_suffix(file_path: str) -> str:
+    """Return the extension of file_path including the dot, or ""."""
+    _, dot, ext = file_path.rpartition(".")
+    return f".{ext}" if dot and "/" not in ext else ""
 
 
 # ---------------------------------------------------------------------------
@@ -192,21 +248,31 @@ DEFAULT_RULES = [
 # ---------------------------------------------------------------------------
 
 
+# Every top-level def/class statement starts a line (after optional form
+# feeds), so this count is an upper bound on the AST's top-level definitions.
+_TOPLEVEL_DEF_RE = re.compile(r'^\f*(?:async\s+def|def|class)\b', re.MULTILINE)
+
+
 def check_god_module(source: str, threshold: int = 20) -> Optional[dict]:
     """
     Check if a Python module has too many top-level definitions.
 
+    Modules whose line-start def/class count is within the threshold are
+    passed without parsing; only candidates are parsed for an exact count.
+
     Returns dict with count info if threshold exceeded, None otherwise.
     """
-    import ast as _ast
+    if len(_TOPLEVEL_DEF_RE.findall(source)) <= threshold:
+        return None
+
     try:
-        tree = _ast.parse(source)
+        tree = ast.parse(source)
     except SyntaxError:
         return None
 
     top_level_defs = 0
-    for node in _ast.iter_child_nodes(tree):
-        if isinstance(node, (_ast.FunctionDef, _ast.AsyncFunctionDef, _ast.ClassDef)):
+    for node in ast.iter_child_nodes(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
             top_level_defs += 1
 
     if top_level_defs > threshold:
@@ -230,6 +296,9 @@ def check_file_length(source: str, threshold: int = 500) -> Optional[dict]:
 # ---------------------------------------------------------------------------
 
 
+_HUNK_START_RE = re.compile(r'\+(\d+)')
+
+
 def extract_added_lines_with_numbers(diff_text: str) -> dict[str, list[tuple[int, str]]]:
     """
     Extract added lines from diff, grouped by file.
@@ -237,30 +306,76 @@ def extract_added_lines_with_numbers(diff_text: str) -> dict[str, list[tuple[int
     Returns dict mapping file_path -> list of (line_number, line_content).
     """
     result: dict[str, list[tuple[int, str]]] = {}
-    current_file = None
+    added = None  # Added-line list of the current file
     line_num = 0
 
+    # Dispatch on the first character: context and removed lines, the bulk
+    # of most diffs, then cost one slice and compare instead of a chain of
+    # startswith() calls.
     for line in diff_text.split("\n"):
-        if line.startswith("+++ b/"):
-            current_file = line[6:]
-            if current_file not in result:
-                result[current_file] = []
+        first = line[:1]
+        if first == "+":
+            if line[1:3] != "++":
+                if added is not None:
+                    added.append((line_num, line[1:]))
+            elif line.startswith("+++ b/"):
+                added = result.setdefault(line[6:], [])
+                continue
+        elif first == "@":
+            if line[1:2] == "@":
+                match = _HUNK_START_RE.search(line)
+                if match:
+                    line_num = int(match.group(1))
+                continue
+        elif first == "-":
             continue
+        line_num += 1
 
-        if line.startswith("@@"):
-            match = re.search(r'\+(\d+)', line)
-            if match:
-                line_num = int(match.group(1))
-            continue
+    return result
 
-        if line.startswith("+") and not line.startswith("+++"):
-            if current_file:
-                result[current_file].append((line_num, line[1:]))
-            line_num += 1
-        elif not line.startswith("-"):
-            line_num += 1
 
-    return result
+def build_line_buffer(added: list[tuple[int, str]]) -> tuple[str, list[int]]:
+    """
+    Join a file's added lines into one newline-separated buffer.
+
+    Returns (buffer, line_starts) where line_starts[i] is the offset of the
+    i-th added line, so a match offset maps back to it with bisect_right.
+    """
+    contents = [content for _, content in added]
+    if not contents:
+        return "", []
+    line_starts = list(accumulate((len(c) + 1 for c in contents[:-1]), initial=0))
+    return "\n".join(contents), line_starts
+
+
+def match_line_indexes(pattern: re.Pattern, buf: str, line_starts: list[int]) -> list[int]:
+    """
+    Return the indexes of buffer lines that contain a match of pattern.
+
+    The buffer is scanned with one search per matching line rather than one
+    per line. A match that runs across a newline (e.g. via \\s*) is
+    re-checked within its own line's bounds, so a line matches exactly when
+    pattern.search(line) would. Patterns must use re.MULTILINE so ^ and $
+    anchor at line boundaries; analyze() scans other patterns line by line.
+    """
+    hits = []
+    if not line_starts:
+        return hits
+    last = len(line_starts) - 1
+    search = pattern.search
+    pos = 0
+    while True:
+        m = search(buf, pos)
+        if m is None:
+            break
+        idx = bisect_right(line_starts, m.start()) - 1
+        end = line_starts[idx + 1] - 1 if idx < last else len(buf)
+        if m.end() <= end or search(buf, line_starts[idx], end):
+            hits.append(idx)
+        if idx == last:
+            break
+        pos = end + 1
+    return hits
 
 
 # ---------------------------------------------------------------------------
@@ -268,15 +383,6 @@ def extract_added_lines_with_numbers(diff_text: str) -> dict[str, list[tuple[int
 # ---------------------------------------------------------------------------
 
 
-def _read_file_safe(file_path: str, repo_root: str) -> Optional[str]:
-    """Safely read a file, returning None on failure."""
-    full_path = Path(repo_root) / file_path
-    try:
-        return full_path.read_text(encoding="utf-8", errors="replace")
-    except OSError:
-        return None
-
-
 def analyze(
     diff_text: str,
     changed_files: list[str],
@@ -284,7 +390,7 @@ def analyze(
     rules: Optional[list[ArchRule]] = None,
     god_module_threshold: int = 20,
     file_length_threshold: int = 500,
-) -> list[Finding]:
+) -> Iterator[Finding]:
     """
     Run architecture analysis on changed files.
 
@@ -299,52 +405,84 @@ def analyze(
         god_module_threshold:   Max top-level definitions per module
         file_length_threshold:  Max lines per file
 
-    Returns list of Finding objects for architectural violations.
+    Yields Finding objects for architectural violations in file order, so
+    a caller that caps findings stops the scan early.
     """
-    if rules is None:
-        rules = DEFAULT_RULES
-
-    findings = []
     added_lines = extract_added_lines_with_numbers(diff_text)
 
     for file_path in changed_files:
         file_added = added_lines.get(file_path, [])
-        source = _read_file_safe(file_path, repo_root)
+        buf, line_starts = build_line_buffer(file_added)
+
+        if rules is None:
+            file_rules = [
+                rule for rule in _rules_for_suffix(_file_suffix(file_path))
+                if not (rule.file_exclude and rule.file_exclude.search(file_path))
+            ]
+        else:
+            file_rules = [
+                rule for rule in rules
+                if rule.name != "god-module" and rule.applies_to(file_path)
+            ]
 
         # Check pattern-based rules against added lines only
-        for rule in rules:
-            if rule.name == "god-module":
-                continue  # Handled separately below
-            if not rule.applies_to(file_path):
+        for rule in file_rules:
+            if rule.pattern.flags & re.MULTILINE:
+                hit_lines = [file_added[i] for i in match_line_indexes(rule.pattern, buf, line_starts)]
+            elif rule.ascii_folded is not None:
+                # Non-ASCII lines keep IGNORECASE matching: str.lower() and
+                # the regex engine fold characters like U+017F differently.
+                folded, search = rule.ascii_folded.search, rule.pattern.search
+                hit_lines = [
+                    added for added in file_added
+                    if (folded(added[1].lower()) if added[1].isascii() else search(added[1]))
+                ]
+            else:
+                hit_lines = [added for added in file_added if rule.pattern.search(added[1])]
+
+            for line_num, line_content in hit_lines:
+                yield Finding(
+                    id="",
+                    commit_hash="",
+                    analyzer="architecture",
+                    severity=rule.severity,
+                    title=rule.title,
+                    description=(
+                        f"Rule '{rule.name}' violated in {file_path} at line {line_num}:\n"
+                        f"  {line_content.strip()}\n\n"
+                        f"{rule.description}"
+                    ),
+                    file_path=file_path,
+                    line_start=line_num,
+                    line_end=line_num,
+                    suggestion=rule.suggestion,
+                    metadata={"rule": rule.name},
+                )
+
+        # Removing lines cannot create a god module or a long file, so skip
+        # the read and parse when the diff only deletes from this file. Files
+        # without a hunk header in the diff are still checked.
+        if not file_added and file_path in added_lines:
+            continue
+
+        # A file of n bytes has at most n + 1 lines, so a non-Python file
+        # smaller than the threshold cannot be too long and is not read.
+        if not file_path.endswith(".py"):
+            try:
+                size = os.path.getsize(os.path.join(repo_root, file_path))
+            except OSError:
+                continue
+            if size < file_length_threshold:
                 continue
 
-            for line_num, line_content in file_added:
-                if rule.pattern.search(line_content):
-                    finding = Finding(
-                        id="",
-                        commit_hash="",
-                        analyzer="architecture",
-                        severity=rule.severity,
-                        title=f"{rule.name}: {rule.description}",
-                        description=(
-                            f"Rule '{rule.name}' violated in {file_path} at line {line_num}:\n"
-                            f"  {line_content.strip()}\n\n"
-                            f"{rule.description}"
-                        ),
-                        file_path=file_path,
-                        line_start=line_num,
-                        line_end=line_num,
-                        suggestion=rule.suggestion,
-                        metadata={"rule": rule.name},
-                    )
-                    findings.append(finding)
+        source = read_file_safe(file_path, repo_root)
 
         # Whole-file structural checks
         if source and file_path.endswith(".py"):
             # God module check
             god_result = check_god_module(source, god_module_threshold)
             if god_result:
-                findings.append(Finding(
+                yield Finding(
                     id="",
                     commit_hash="",
                     analyzer="architecture",
@@ -362,13 +500,13 @@ def analyze(
                         "Group related functions/classes into separate files."
                     ),
                     metadata={"rule": "god-module", **god_result},
-                ))
+                )
 
         # File length check (any language)
         if source:
             length_result = check_file_length(source, file_length_threshold)
             if length_result:
-                findings.append(Finding(
+                yield Finding(
                     id="",
                     commit_hash="",
                     analyzer="architecture",
@@ -383,6 +521,4 @@ def analyze(
                     line_start=1,
                     suggestion="Consider splitting into smaller, focused modules.",
                     metadata={"rule": "file-length", **length_result},
-                ))
-
-    return findings
+                )
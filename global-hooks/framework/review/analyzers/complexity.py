@@ -17,10 +17,10 @@ import ast
 import re
 import sys
 from pathlib import Path
-from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from findings_store import Finding, Severity
+from source_cache import read_file_safe
 
 
 # ---------------------------------------------------------------------------
@@ -28,92 +28,74 @@ from findings_store import Finding, Severity
 # ---------------------------------------------------------------------------
 
 
-class ComplexityVisitor(ast.NodeVisitor):
-    """AST visitor that computes McCabe cyclomatic complexity per function."""
-
-    def __init__(self):
-        self.functions: list[dict] = []
-        self._current_complexity = 0
-        self._current_name = ""
-        self._current_start = 0
-        self._current_end = 0
-
-    def _visit_function(self, node):
-        """Visit a function/method definition."""
-        # Save outer state
-        outer_complexity = self._current_complexity
-        outer_name = self._current_name
-        outer_start = self._current_start
-        outer_end = self._current_end
-
-        self._current_complexity = 1  # Base complexity
-        self._current_name = node.name
-        self._current_start = node.lineno
-        self._current_end = node.end_lineno or node.lineno
-
-        # Visit body
-        self.generic_visit(node)
-
-        # Record function
-        self.functions.append({
-            "name": self._current_name,
-            "complexity": self._current_complexity,
-            "line_start": self._current_start,
-            "line_end": self._current_end,
-        })
-
-        # Restore outer state
-        self._current_complexity = outer_complexity
-        self._current_name = outer_name
-        self._current_start = outer_start
-        self._current_end = outer_end
-
-    def visit_FunctionDef(self, node):
-        self._visit_function(node)
-
-    def visit_AsyncFunctionDef(self, node):
-        self._visit_function(node)
-
-    # Decision points that increase complexity
-    def visit_If(self, node):
-        self._current_complexity += 1
-        self.generic_visit(node)
-
-    def visit_For(self, node):
-        self._current_complexity += 1
-        self.generic_visit(node)
-
-    def visit_While(self, node):
-        self._current_complexity += 1
-        self.generic_visit(node)
-
-    def visit_ExceptHandler(self, node):
-        self._current_complexity += 1
-        self.generic_visit(node)
-
-    def visit_With(self, node):
-        self._current_complexity += 1
-        self.generic_visit(node)
+def _one(node) -> int:
+    return 1
+
+
+# Decision points that increase complexity, keyed by node type
+_DECISION_POINTS = {
+    ast.If: _one,
+    ast.For: _one,
+    ast.While: _one,
+    ast.ExceptHandler: _one,
+    ast.With: _one,
+    # Ternary expression: x if cond else y
+    ast.IfExp: _one,
+    # Each 'and' / 'or' adds a decision point
+    ast.BoolOp: lambda node: len(node.values) - 1,
+    # List/dict/set comprehensions with conditions
+    ast.comprehension: lambda node: len(node.ifs),
+    # Python 3.10+ match/case
+    ast.Match: lambda node: len(node.cases),
+}
 
-    def visit_BoolOp(self, node):
-        # Each 'and' / 'or' adds a decision point
-        self._current_complexity += len(node.values) - 1
-        self.generic_visit(node)
+_FUNCTION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
 
-    def visit_IfExp(self, node):
-        # Ternary expression: x if cond else y
-        self._current_complexity += 1
-        self.generic_visit(node)
 
-    def visit_comprehension(self, node):
-        # List/dict/set comprehensions with conditions
-        self._current_complexity += len(node.ifs)
-        self.generic_visit(node)
+def _scope_complexity(scope: ast.AST, functions: list[dict]) -> int:
+    """
+    Count decision points in scope, excluding nested functions.
 
-    def visit_Match(self, node):
-        # Python 3.10+ match/case
-        self._current_complexity += len(node.cases)
-        self.generic_visit(node)
+    Nested functions are scored on their own and appended to functions,
+    innermost first, before the caller records scope itself.
+    """
+    complexity = 0
+    nested = []
+    stack = list(ast.iter_child_nodes(scope))
+    while stack:
+        node = stack.pop()
+        node_type = type(node)
+        if node_type in _FUNCTION_TYPES:
+            nested.append(node)
+            continue
+        count = _DECISION_POINTS.get(node_type)
+        if count is not None:
+            complexity += count(node)
+        # Same children, in the same order, as ast.iter_child_nodes
+        # without a generator per node
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                stack.extend([item for item in value if isinstance(item, ast.AST)])
+            elif isinstance(value, ast.AST):
+                stack.append(value)
+
+    # Children are popped last-first, so nested functions were found in
+    # reverse source order
+    for node in reversed(nested):
+        _record_function(node, functions)
+    return complexity
+
+
+def _record_function(node: ast.AST, functions: list[dict]) -> None:
+    """Score a function/method definition and append it to functions."""
+    complexity = 1 + _scope_complexity(node, functions)  # Base complexity
+    functions.append({
+        "name": node.name,
+        "complexity": complexity,
+        "line_start": node.lineno,
+        "line_end": node.end_lineno or node.lineno,
+    })
 
 
 def analyze_python_complexity(source: str) -> list[dict]:
@@ -127,9 +109,9 @@ def analyze_python_complexity(source: str) -> list[dict]:
     except SyntaxError:
         return []
 
-    visitor = ComplexityVisitor()
-    visitor.visit(tree)
-    return visitor.functions
+    functions: list[dict] = []
+    _scope_complexity(tree, functions)
+    return functions
 
 
 # ---------------------------------------------------------------------------
@@ -203,9 +185,13 @@ def analyze_heuristic_complexity(
 
     # Find function boundaries (simplified: look for function starts)
     func_starts = []
+    line_num = 1
+    last_pos = 0
     for match in func_pattern.finditer(source):
         name = next((g for g in match.groups() if g), "anonymous")
-        line_num = source[:match.start()].count("\n") + 1
+        # Count newlines since the previous match, not from the file start
+        line_num += source.count("\n", last_pos, match.start())
+        last_pos = match.start()
         func_starts.append((name, line_num, match.start()))
 
     if not func_starts:
@@ -247,15 +233,6 @@ def analyze_heuristic_complexity(
 # ---------------------------------------------------------------------------
 
 
-def _read_file_safe(file_path: str, repo_root: str) -> Optional[str]:
-    """Safely read a file, returning None on failure."""
-    full_path = Path(repo_root) / file_path
-    try:
-        return full_path.read_text(encoding="utf-8", errors="replace")
-    except OSError:
-        return None
-
-
 def analyze(
     diff_text: str,
     changed_files: list[str],
@@ -277,7 +254,7 @@ def analyze(
 
     for file_path in changed_files:
         ext = Path(file_path).suffix.lower()
-        source = _read_file_safe(file_path, repo_root)
+        source = read_file_safe(file_path, repo_root)
         if not source:
             continue
 
@@ -21,11 +21,12 @@ Limitations:
 import ast
 import re
 import sys
+from collections import Counter
 from pathlib import Path
-from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from findings_store import Finding, Severity
+from source_cache import read_file_safe
 
 
 # ---------------------------------------------------------------------------
@@ -34,14 +35,24 @@ from findings_store import Finding, Severity
 
 
 class DefinitionCollector(ast.NodeVisitor):
-    """Collect all top-level and class-level definitions."""
+    """Collect top-level and class-level definitions and all name references.
+
+    Definitions and usages are gathered in the same traversal so each tree
+    is walked once.
+    """
 
     def __init__(self):
         self.definitions: dict[str, dict] = {}  # name -> {type, line, end_line}
         self.imports: dict[str, dict] = {}       # name -> {module, line}
+        self.used_names: set[str] = set()
         self._in_class = False
         self._class_name = ""
 
+    def visit_Name(self, node):
+        # Every name reference, including those in decorators, annotations,
+        # base classes and the receivers of attribute access and calls
+        self.used_names.add(node.id)
+
     def visit_FunctionDef(self, node):
         if not self._in_class:
             # Skip dunder methods and test functions
@@ -92,57 +103,6 @@ class DefinitionCollector(ast.NodeVisitor):
             }
 
 
-class UsageCollector(ast.NodeVisitor):
-    """Collect all name references (usages) in the source."""
-
-    def __init__(self):
-        self.used_names: set[str] = set()
-
-    def visit_Name(self, node):
-        self.used_names.add(node.id)
-        self.generic_visit(node)
-
-    def visit_Attribute(self, node):
-        # Track attribute access on names
-        if isinstance(node.value, ast.Name):
-            self.used_names.add(node.value.id)
-        self.generic_visit(node)
-
-    def visit_Call(self, node):
-        if isinstance(node.func, ast.Name):
-            self.used_names.add(node.func.id)
-        elif isinstance(node.func, ast.Attribute):
-            if isinstance(node.func.value, ast.Name):
-                self.used_names.add(node.func.value.id)
-        self.generic_visit(node)
-
-    def visit_FunctionDef(self, node):
-        # Decorators reference names
-        for decorator in node.decorator_list:
-            self.visit(decorator)
-        # Annotations reference names
-        if node.returns:
-            self.visit(node.returns)
-        for arg in node.args.args + node.args.kwonlyargs:
-            if arg.annotation:
-                self.visit(arg.annotation)
-        # Visit body
-        self.generic_visit(node)
-
-    def visit_AsyncFunctionDef(self, node):
-        self.visit_FunctionDef(node)
-
-    def visit_ClassDef(self, node):
-        # Base classes reference names
-        for base in node.bases:
-            self.visit(base)
-        for keyword in node.keywords:
-            self.visit(keyword.value)
-        for decorator in node.decorator_list:
-            self.visit(decorator)
-        self.generic_visit(node)
-
-
 def _should_skip_file(file_path: str, source: str) -> bool:
     """Check if file should be skipped for dead code analysis."""
     path = Path(file_path)
@@ -182,18 +142,15 @@ def analyze_python_dead_code(
     except SyntaxError:
         return []
 
-    # Collect definitions and usages
+    # Collect definitions and usages in one pass
     defs = DefinitionCollector()
     defs.visit(tree)
 
-    usages = UsageCollector()
-    usages.visit(tree)
-
     dead = []
 
     # Check functions and classes
     for name, info in defs.definitions.items():
-        if name not in usages.used_names:
+        if name not in defs.used_names:
             # Check if it might be referenced in string form (decorators, etc.)
             if name in source.replace(f"def {name}", "").replace(f"class {name}", ""):
                 continue  # Might be used in a string or comment
@@ -207,7 +164,7 @@ def analyze_python_dead_code(
 
     # Check imports
     for name, info in defs.imports.items():
-        if name not in usages.used_names:
+        if name not in defs.used_names:
             # Double check: might be used in type annotations as strings
             if f"'{name}'" in source or f'"{name}"' in source:
                 continue
@@ -227,6 +184,15 @@ def analyze_python_dead_code(
 # ---------------------------------------------------------------------------
 
 
+# Non-exported JavaScript/TypeScript function and variable definitions
+JS_DEFINITION_PATTERN = re.compile(
+    r'^(?!export\b)\s*(?:const|let|var|function)\s+(\w+)',
+    re.MULTILINE,
+)
+
+IDENTIFIER_PATTERN = re.compile(r'\w+')
+
+
 def analyze_heuristic_dead_code(
     source: str,
     file_path: str,
@@ -244,16 +210,18 @@ def analyze_heuristic_dead_code(
     if ext in (".js", ".jsx", ".ts", ".tsx"):
         # Find exported functions that might be unused within the file
         # Only flag non-exported functions
-        func_pattern = re.compile(
-            r'^(?!export\b)\s*(?:const|let|var|function)\s+(\w+)',
-            re.MULTILINE,
-        )
-        for match in func_pattern.finditer(source):
+        # Whole-word occurrences of each identifier, counted once per file
+        counts = None
+        line = 1
+        last_pos = 0
+        for match in JS_DEFINITION_PATTERN.finditer(source):
             name = match.group(1)
+            if counts is None:
+                counts = Counter(IDENTIFIER_PATTERN.findall(source))
             # Count occurrences (subtract the definition itself)
-            count = len(re.findall(r'\b' + re.escape(name) + r'\b', source))
-            if count <= 1:
-                line = source[:match.start()].count("\n") + 1
+            if counts[name] <= 1:
+                line += source.count("\n", last_pos, match.start())
+                last_pos = match.start()
                 dead.append({
                     "name": name,
                     "type": "function/variable",
@@ -270,15 +238,6 @@ def analyze_heuristic_dead_code(
 # ---------------------------------------------------------------------------
 
 
-def _read_file_safe(file_path: str, repo_root: str) -> Optional[str]:
-    """Safely read a file, returning None on failure."""
-    full_path = Path(repo_root) / file_path
-    try:
-        return full_path.read_text(encoding="utf-8", errors="replace")
-    except OSError:
-        return None
-
-
 def analyze(
     diff_text: str,
     changed_files: list[str],
@@ -298,7 +257,7 @@ def analyze(
 
     for file_path in changed_files:
         ext = Path(file_path).suffix.lower()
-        source = _read_file_safe(file_path, repo_root)
+        source = read_file_safe(file_path, repo_root)
         if not source:
             continue
 
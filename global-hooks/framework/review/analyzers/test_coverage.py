@@ -25,6 +25,7 @@ from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from findings_store import Finding, Severity
+from source_cache import read_file_safe
 
 
 # ---------------------------------------------------------------------------
@@ -192,11 +193,8 @@ def check_test_coverage_for_definitions(
         return definitions  # No test file means nothing is covered
 
     # Read test file
-    try:
-        test_content = (Path(repo_root) / test_file_path).read_text(
-            encoding="utf-8", errors="replace"
-        )
-    except OSError:
+    test_content = read_file_safe(test_file_path, repo_root)
+    if test_content is None:
         return definitions
 
     uncovered = []
@@ -17,8 +17,9 @@ import sys
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 # Local imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -337,11 +338,12 @@ class ReviewEngine:
                 continue
 
             try:
-                findings = analyzer_map[analyzer_name](diff_text, changed_files)
-
-                # Cap findings per analyzer
-                if len(findings) > self.config.max_findings_per_analyzer:
-                    findings = findings[:self.config.max_findings_per_analyzer]
+                # Cap findings per analyzer; a streaming analyzer stops
+                # scanning once the cap is reached.
+                findings = list(islice(
+                    analyzer_map[analyzer_name](diff_text, changed_files),
+                    self.config.max_findings_per_analyzer,
+                ))
 
                 # Set commit hash and generate IDs
                 for idx, finding in enumerate(findings):
@@ -422,7 +424,7 @@ class ReviewEngine:
 
     def _run_architecture(
         self, diff_text: str, changed_files: list[str]
-    ) -> list[Finding]:
+    ) -> Iterator[Finding]:
         return architecture.analyze(
             diff_text,
             changed_files,
@@ -0,0 +1,32 @@
+"""
+Source Cache - Shared file reads for the review analyzers.
+
+Every analyzer reads the changed files of the same commit. Reads go
+through one process-local LRU cache keyed by path, mtime and size, so a
+review pass reads each file once regardless of how many analyzers run,
+and a file rewritten between passes is read again.
+"""
+
+import functools
+import os
+from pathlib import Path
+from typing import Optional
+
+
+@functools.lru_cache(maxsize=256)
+def _read_cached(path: str, mtime_ns: int, size: int) -> Optional[str]:
+    """Read path as UTF-8 text; mtime_ns and size only key the cache."""
+    try:
+        return Path(path).read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+
+
+def read_file_safe(file_path: str, repo_root: str) -> Optional[str]:
+    """Safely read a file, returning None on failure."""
+    full_path = os.path.join(repo_root, file_path)
+    try:
+        st = os.stat(full_path)
+    except OSError:
+        return None
+    return _read_cached(full_path, st.st_mtime_ns, st.st_size)
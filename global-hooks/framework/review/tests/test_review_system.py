@@ -133,6 +133,29 @@ class TestFindingsStore:
         assert FindingStatus.WONTFIX.value == "wontfix"
 
 
+# ---------------------------------------------------------------------------
+# Source Cache Tests
+# ---------------------------------------------------------------------------
+
+
+class TestSourceCache:
+    """Tests for source_cache.py"""
+
+    def test_read_is_cached_until_file_changes(self):
+        """Test that repeated reads hit the cache and rewrites are re-read."""
+        from source_cache import read_file_safe
+
+        with tempfile.TemporaryDirectory() as repo:
+            path = Path(repo, "mod.py")
+            path.write_text("x = 1\n")
+            first = read_file_safe("mod.py", repo)
+            assert read_file_safe("mod.py", repo) is first
+
+            path.write_text("x = 22\n")
+            assert read_file_safe("mod.py", repo) == "x = 22\n"
+            assert read_file_safe("missing.py", repo) is None
+
+
 # ---------------------------------------------------------------------------
 # Duplication Analyzer Tests
 # ---------------------------------------------------------------------------
@@ -270,6 +293,29 @@ def check(a, b, c):
         # if + and + or = 3 + 1 base = 4
         assert functions[0]["complexity"] >= 3
 
+    def test_nested_functions_scored_separately(self):
+        """Test that inner functions do not add to the outer function's score."""
+        from analyzers.complexity import analyze_python_complexity
+
+        source = """
+def outer(items):
+    def first(x):
+        if x:
+            return 1
+        return 0
+
+    for item in items:
+        def second(y):
+            while y and y > 1:
+                y -= 1
+            return y
+    return first
+"""
+        functions = analyze_python_complexity(source)
+        scores = [(f["name"], f["complexity"]) for f in functions]
+        # Inner functions are recorded before the function containing them
+        assert scores == [("first", 2), ("second", 3), ("outer", 2)]
+
     def test_syntax_error_returns_empty(self):
         """Test that syntax errors produce empty results."""
         from analyzers.complexity import analyze_python_complexity
@@ -372,6 +418,33 @@ def public_unused():
         assert "_private_helper" not in names
         assert "public_unused" in names
 
+    def test_references_outside_bodies_count_as_usage(self):
+        """Test that decorators, annotations and base classes count as usages."""
+        from analyzers.dead_code import analyze_python_dead_code
+
+        source = """
+from typing import Optional
+from functools import wraps
+
+def traced(fn):
+    return fn
+
+class Base:
+    pass
+
+class Child(Base):
+    @traced
+    def run(self) -> Optional[int]:
+        return wraps
+"""
+        dead = analyze_python_dead_code(source, "test.py")
+        names = [d["name"] for d in dead]
+        assert "Optional" not in names
+        assert "traced" not in names
+        assert "Base" not in names
+        assert "wraps" not in names
+        assert "Child" in names
+
     def test_skip_test_files(self):
         """Test that test files are skipped."""
         from analyzers.dead_code import _should_skip_file
@@ -381,6 +454,24 @@ def public_unused():
         assert _should_skip_file("tests/test_bar.py", "") is True
         assert _should_skip_file("src/foo.py", "") is False
 
+    def test_heuristic_counts_whole_identifiers(self):
+        """Test that JS usages only count whole-word occurrences."""
+        from analyzers.dead_code import analyze_heuristic_dead_code
+
+        source = (
+            "function helper() { return 1; }\n"
+            "const helperValue = 2;\n"
+            "export function main() {\n"
+            "  return helper();\n"
+            "}\n"
+            "function orphan() {}\n"
+        )
+        dead = analyze_heuristic_dead_code(source, "app.js")
+        assert [(d["name"], d["line"]) for d in dead] == [
+            ("helperValue", 2),
+            ("orphan", 6),
+        ]
+
     def test_skip_init_files(self):
         """Test that __init__.py files are skipped."""
         from analyzers.dead_code import _should_skip_file
@@ -444,6 +535,14 @@ class TestArchitectureAnalyzer:
         result = check_god_module(source, threshold=20)
         assert result is None
 
+    def test_god_module_ignores_defs_in_strings(self):
+        """Test that def lines inside strings are not counted as definitions."""
+        from analyzers.architecture import check_god_module
+
+        body = "\n".join(f"def fake_{i}(): pass" for i in range(25))
+        source = f'TEMPLATE = """\n{body}\n"""\n\ndef real(): pass\n'
+        assert check_god_module(source, threshold=20) is None
+
     def test_file_length_check(self):
         """Test file length detection."""
         from analyzers.architecture import check_file_length
@@ -456,6 +555,80 @@ class TestArchitectureAnalyzer:
         assert result is not None
         assert result["lines"] > 500
 
+    def test_buffer_scan_matches_line_search(self):
+        """Test that whole-buffer scanning flags the same lines as per-line search."""
+        from analyzers.architecture import build_line_buffer, match_line_indexes, DEFAULT_RULES
+
+        lines = ["", "    print(1)", "x = 1; print(2); print(3)", "except", ":", "except:", "# todo: later"]
+        added = list(enumerate(lines, start=1))
+        buf, line_starts = build_line_buffer(added)
+
+        for rule in DEFAULT_RULES:
+            expected = [i for i, line in enumerate(lines) if rule.pattern.search(line)]
+            assert match_line_indexes(rule.pattern, buf, line_starts) == expected, rule.name
+
+    def test_ascii_folded_secret_matches_ignorecase(self):
+        """Test that the lowercased secret search agrees with IGNORECASE."""
+        from analyzers.architecture import analyze, DEFAULT_RULES
+
+        lines = [
+            'API_KEY = "ABCDEFGHIJKLMNOP1234"',
+            'Token: "abcdefghijklmnopqrst"',
+            'pasſword = "abcdefghijklmnopqrst"',
+            'tokeN = "ſhort"',
+            'name = "not a secret at all"',
+        ]
+        diff = "+++ b/settings.py\n@@ -0,0 +1,5 @@\n" + "".join(f"+{line}\n" for line in lines)
+        secret = next(r for r in DEFAULT_RULES if r.name == "hardcoded-secret")
+        expected = [i + 1 for i, line in enumerate(lines) if secret.pattern.search(line)]
+
+        findings = analyze(diff, ["settings.py"], "/nonexistent")
+        assert [f.line_start for f in findings if f.metadata["rule"] == "hardcoded-secret"] == expected
+
+    def test_rules_for_suffix_matches_applies_to(self):
+        """Test that cached per-suffix rules agree with ArchRule.applies_to."""
+        from analyzers.architecture import _file_suffix, _rules_for_suffix, DEFAULT_RULES
+
+        for path in ["src/app.py", "web/main.tsx", "lib/cli.py", "test_app.py", "Makefile", "a.d/run"]:
+            cached = [
+                rule.name for rule in _rules_for_suffix(_file_suffix(path))
+                if not (rule.file_exclude and rule.file_exclude.search(path))
+            ]
+            expected = [
+                rule.name for rule in DEFAULT_RULES
+                if rule.name != "god-module" and rule.applies_to(path)
+            ]
+            assert cached == expected, path
+
+    def test_deletion_only_diff_skips_structural_checks(self):
+        """Test that whole-file checks only run for files the diff adds to."""
+        from analyzers.architecture import analyze
+
+        with tempfile.TemporaryDirectory() as repo:
+            for name in ("grown.txt", "shrunk.txt", "renamed.txt"):
+                Path(repo, name).write_text("line\n" * 600)
+
+            diff = (
+                "+++ b/grown.txt\n@@ -1,0 +1,1 @@\n+line\n"
+                "+++ b/shrunk.txt\n@@ -1,1 +0,0 @@\n-line\n"
+            )
+            findings = list(analyze(diff, ["grown.txt", "shrunk.txt", "renamed.txt"], repo))
+
+        long_files = {f.file_path for f in findings if f.metadata.get("rule") == "file-length"}
+        assert long_files == {"grown.txt", "renamed.txt"}
+
+    def test_file_length_boundary_for_small_files(self):
+        """Test that the size shortcut keeps the exact line threshold."""
+        from analyzers.architecture import analyze
+
+        with tempfile.TemporaryDirectory() as repo:
+            Path(repo, "at.txt").write_text("\n" * 9)     # 10 lines, 9 bytes
+            Path(repo, "over.txt").write_text("\n" * 10)  # 11 lines, 10 bytes
+            diff = "+++ b/at.txt\n@@ -0,0 +1 @@\n+\n+++ b/over.txt\n@@ -0,0 +1 @@\n+\n"
+            findings = list(analyze(diff, ["at.txt", "over.txt"], repo, file_length_threshold=10))
+
+        assert [f.file_path for f in findings] == ["over.txt"]
+
 
 # ---------------------------------------------------------------------------
 # Test Coverage Analyzer Tests
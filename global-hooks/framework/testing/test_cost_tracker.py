@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Tests for monitoring/cost_tracker.py"""
+
+import json
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+MONITORING_DIR = Path(__file__).parent.parent / "monitoring"
+sys.path.insert(0, str(MONITORING_DIR))
+
+import cost_tracker
+from cost_tracker import CostTracker
+
+
+def _record(tracker, **kwargs):
+    return tracker.record_usage(
+        session_id=kwargs.pop("session_id", "s1"),
+        model=kwargs.pop("model", "claude-sonnet-4-5"),
+        input_tokens=kwargs.pop("input_tokens", 1000),
+        output_tokens=kwargs.pop("output_tokens", 100),
+        agent_name=kwargs.pop("agent_name", "builder"),
+        **kwargs,
+    )
+
+
+def _at(monkeypatch, when: datetime) -> None:
+    """Make record_usage stamp events with ``when``."""
+    epoch_ns = int(when.timestamp()) * 1_000_000_000
+    monkeypatch.setattr(cost_tracker.time, "time_ns", lambda: epoch_ns)
+
+
+def _log_lines(path: Path) -> list:
+    return [json.loads(line) for line in path.read_bytes().splitlines()]
+
+
+# ── read-after-write ─────────────────────────────────────────────────
+
+def test_summary_sees_events_still_queued_for_writer(tmp_path):
+    tracker = CostTracker(tmp_path / "cost_tracking.jsonl")
+    try:
+        for expected in (1, 2, 3):
+            _record(tracker)
+            assert tracker.get_summary("today")["event_count"] == expected
+            assert tracker.get_summary("all")["event_count"] == expected
+            assert tracker.get_daily_breakdown(days=1)[0]["event_count"] == expected
+    finally:
+        tracker.close()
+
+
+# ── background writer ────────────────────────────────────────────────
+
+def test_close_drains_buffered_lines(tmp_path):
+    tracker = CostTracker(tmp_path / "cost_tracking.jsonl")
+    for i in range(5):
+        _record(tracker, input_tokens=i)
+    tracker.close()
+    tracker.close()  # Safe to call twice
+
+    lines = _log_lines(tracker.log_path)
+    assert [entry["input_tokens"] for entry in lines] == [0, 1, 2, 3, 4]
+
+
+def test_record_after_close_restarts_writer(tmp_path):
+    tracker = CostTracker(tmp_path / "cost_tracking.jsonl")
+    _record(tracker)
+    tracker.close()
+    _record(tracker)
+    tracker.close()
+
+    assert len(_log_lines(tracker.log_path)) == 2
+
+
+def test_concurrent_appends_write_whole_lines(tmp_path):
+    tracker = CostTracker(tmp_path / "cost_tracking.jsonl")
+
+    def worker(n):
+        for _ in range(200):
+            _record(tracker, session_id=f"s{n}")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    tracker.close()
+
+    lines = _log_lines(tracker.log_path)
+    assert len(lines) == 800
+    assert {entry["session_id"] for entry in lines} == {"s0", "s1", "s2", "s3"}
+
+
+def test_full_buffer_drops_events(tmp_path, monkeypatch):
+    monkeypatch.setattr(cost_tracker, "LOG_BUFFER_LIMIT", 0)
+    tracker = CostTracker(tmp_path / "cost_tracking.jsonl")
+    entry = _record(tracker)
+    tracker.close()
+
+    assert entry["tier"] == "sonnet"
+    assert not tracker.log_path.exists()
+
+
+# ── index and rollup invalidation ────────────────────────────────────
+
+def _seed(tmp_path, count=3):
+    """A closed tracker whose log holds ``count`` events."""
+    tracker = CostTracker(tmp_path / "cost_tracking.jsonl")
+    for i in range(count):
+        _record(tracker, input_tokens=i + 1)
+    tracker.close()
+    return tracker, tracker.log_path
+
+
+def test_rollup_rebuilt_after_truncation(tmp_path):
+    tracker, log = _seed(tmp_path)
+    assert tracker.get_summary("all")["event_count"] == 3
+    assert tracker._rollup_path(log).exists()
+
+    first = log.read_bytes().splitlines(keepends=True)[0]
+    with open(log, "r+b") as f:
+        f.truncate(len(first))
+
+    summary = tracker.get_summary("all")
+    assert summary["event_count"] == 1
+    assert summary["total_input_tokens"] == 1
+
+
+def test_rollup_rebuilt_after_rewrite(tmp_path):
+    tracker, log = _seed(tmp_path)
+    assert tracker.get_summary("today")["event_count"] == 3
+
+    lines = log.read_bytes().splitlines(keepends=True)
+    replacement = log.with_name("replacement.tmp")
+    replacement.write_bytes(lines[1] + lines[2] + lines[2])
+    replacement.replace(log)
+
+    summary = tracker.get_summary("today")
+    assert summary["event_count"] == 3
+    assert summary["total_input_tokens"] == 2 + 3 + 3
+
+
+def test_index_rebuilt_after_truncation_and_rewrite(tmp_path):
+    tracker, log = _seed(tmp_path)
+    since = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert len(tracker.read_entries(since=since)) == 3
+    assert tracker._index_path(log).exists()
+
+    lines = log.read_bytes().splitlines(keepends=True)
+    with open(log, "r+b") as f:
+        f.truncate(len(lines[0]))
+    assert [e["input_tokens"] for e in tracker.read_entries(since=since)] == [1]
+
+    replacement = log.with_name("replacement.tmp")
+    replacement.write_bytes(lines[2] + lines[1])
+    replacement.replace(log)
+    assert [e["input_tokens"] for e in tracker.read_entries(since=since)] == [3, 2]
+
+
+def test_rollup_picks_up_appended_lines(tmp_path):
+    tracker, log = _seed(tmp_path)
+    assert tracker.get_summary("all")["event_count"] == 3
+    offset = json.loads(tracker._rollup_path(log).read_bytes())["offset"]
+
+    _record(tracker)
+    assert tracker.get_summary("all")["event_count"] == 4
+    assert json.loads(tracker._rollup_path(log).read_bytes())["offset"] > offset
+    tracker.close()
+
+
+def test_parallel_rollup_matches_serial(tmp_path, monkeypatch):
+    tracker, log = _seed(tmp_path, count=300)
+    serial = tracker.get_summary("all")
+
+    tracker._rollup_path(log).unlink()
+    monkeypatch.setattr(cost_tracker, "PARALLEL_SCAN_BYTES", 1)
+    monkeypatch.setattr(cost_tracker.os, "cpu_count", lambda: 2)
+    parallel = tracker.get_summary("all")
+
+    assert parallel["event_count"] == serial["event_count"] == 300
+    assert parallel["total_input_tokens"] == serial["total_input_tokens"]
+    assert parallel["total_cost"] == serial["total_cost"]
+
+
+# ── log layout ───────────────────────────────────────────────────────
+
+def test_month_rollover_keeps_appending_to_log(tmp_path, monkeypatch):
+    tracker = CostTracker(tmp_path / "cost_tracking.jsonl")
+    _at(monkeypatch, datetime(2026, 1, 31, 23, 59, 59, tzinfo=timezone.utc))
+    _record(tracker, input_tokens=1)
+    _at(monkeypatch, datetime(2026, 2, 1, 0, 0, 1, tzinfo=timezone.utc))
+    _record(tracker, input_tokens=2)
+    tracker.close()
+
+    # orch-shared and the Rust SubagentStop hook use this file directly
+    assert [e["input_tokens"] for e in _log_lines(tracker.log_path)] == [1, 2]
+    assert list(tmp_path.glob("cost_tracking_*.jsonl")) == []
+
+    feb_1 = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    assert [e["input_tokens"] for e in tracker.read_entries(since=feb_1)] == [2]
+    assert tracker.get_summary("all")["event_count"] == 2
+
+
+def test_monthly_files_from_earlier_versions_are_read(tmp_path, monkeypatch):
+    tracker = CostTracker(tmp_path / "cost_tracking.jsonl")
+    _at(monkeypatch, datetime(2026, 1, 15, 12, 0, 0, tzinfo=timezone.utc))
+    _record(tracker, input_tokens=1)
+    _at(monkeypatch, datetime(2026, 2, 15, 12, 0, 0, tzinfo=timezone.utc))
+    _record(tracker, input_tokens=2)
+    _at(monkeypatch, datetime(2026, 3, 15, 12, 0, 0, tzinfo=timezone.utc))
+    _record(tracker, input_tokens=3)
+    tracker.close()
+
+    # Move the January and February lines into monthly files
+    lines = tracker.log_path.read_bytes().splitlines(keepends=True)
+    january = tracker._partition_path("2026-01")
+    february = tracker._partition_path("2026-02")
+    january.write_bytes(lines[0])
+    february.write_bytes(lines[1])
+    tracker.log_path.write_bytes(lines[2])
+
+    assert sorted(e["input_tokens"] for e in tracker.read_entries()) == [1, 2, 3]
+    feb_1 = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    assert sorted(e["input_tokens"] for e in tracker.read_entries(since=feb_1)) == [2, 3]
+    since_ms = int(feb_1.timestamp() * 1000)
+    assert tracker._window_files(since_ms, None) == [tracker.log_path, february]
+
+    summary = tracker.get_summary("all")
+    assert summary["event_count"] == 3
+    assert summary["total_input_tokens"] == 6
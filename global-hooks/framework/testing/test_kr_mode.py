@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Tests for korean/kr_mode.py"""
+
+import os
+import sys
+import time
+import types
+from pathlib import Path
+
+KOREAN_DIR = Path(__file__).parent.parent / "korean"
+sys.path.insert(0, str(KOREAN_DIR))
+
+import kr_mode
+
+
+def _fake_anthropic(calls, text="Hello"):
+    """Stand-in anthropic module whose client records prompts and returns text."""
+    def create(**kwargs):
+        calls.append(kwargs["messages"][0]["content"])
+        return types.SimpleNamespace(content=[types.SimpleNamespace(text=text)])
+
+    client = types.SimpleNamespace(messages=types.SimpleNamespace(create=create))
+    return types.SimpleNamespace(Anthropic=lambda: client)
+
+
+# ── translate_to_english ─────────────────────────────────────────────
+
+def test_translation_is_cached_on_disk(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(kr_mode, "CACHE_DIR", tmp_path)
+    monkeypatch.setitem(sys.modules, "anthropic", _fake_anthropic(calls))
+
+    assert kr_mode.translate_to_english("안녕하세요") == "Hello"
+    assert kr_mode.translate_to_english("안녕하세요") == "Hello"
+    assert len(calls) == 1
+
+
+def test_lone_surrogate_prompt_does_not_raise(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(kr_mode, "CACHE_DIR", tmp_path)
+    monkeypatch.setitem(sys.modules, "anthropic", _fake_anthropic(calls))
+
+    # json.loads('"\\ud55c\\ud800"') yields a lone surrogate
+    assert kr_mode.translate_to_english("한\ud800") == "Hello"
+    assert kr_mode.translate_to_english("한\ud800") == "Hello"
+    assert len(calls) == 1
+
+
+def test_cache_evicts_oldest_entries(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(kr_mode, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(kr_mode, "CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setitem(sys.modules, "anthropic", _fake_anthropic(calls))
+
+    oldest = tmp_path / "oldest.txt"
+    older = tmp_path / "older.txt"
+    for age, path in ((200, oldest), (100, older)):
+        path.write_text("cached", encoding="utf-8")
+        stamp = time.time() - age
+        os.utime(path, (stamp, stamp))
+
+    kr_mode.translate_to_english("안녕하세요")
+
+    assert not oldest.exists()
+    assert older.exists()
+    assert len(list(tmp_path.glob("*.txt"))) == 2